@@ -1,10 +1,50 @@
 # core/perimeter.py - WITH HIDDEN PERIMETER OPTION
 import cv2
 import numpy as np
-import time
 import threading
 from typing import Callable, Tuple, Optional
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _point_in_poly_py(poly, x, y):
+    """Even-odd ray-cast test of (x, y) against an (N, 2) float32 polygon"""
+    inside = False
+    n = poly.shape[0]
+    j = n - 1
+    for i in range(n):
+        xi, yi = poly[i, 0], poly[i, 1]
+        xj, yj = poly[j, 0], poly[j, 1]
+        if (yi > y) != (yj > y) and x < (xj - xi) * (y - yi) / (yj - yi) + xi:
+            inside = not inside
+        j = i
+    return inside
+
+
+try:
+    CUDA_AVAILABLE = cv2.cuda.getCudaEnabledDeviceCount() > 0
+except (AttributeError, cv2.error):
+    CUDA_AVAILABLE = False
+
+try:
+    OPENCL_AVAILABLE = cv2.ocl.haveOpenCL()
+except (AttributeError, cv2.error):
+    OPENCL_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    # Explicit signature compiles at import (or loads from the on-disk cache), so the first
+    # per-frame call pays nothing; nogil lets the detection thread run it alongside the GUI
+    point_in_poly = njit('boolean(float32[:,:], float32, float32)',
+                         cache=True, nogil=True)(_point_in_poly_py)
+else:
+    point_in_poly = _point_in_poly_py
+
+
 class PerimeterMonitor:
     """
     Perimeter monitoring system with hidden mode option
@@ -17,11 +57,21 @@ class PerimeterMonitor:
         self.reference_frame = None
         self.perimeter_points = []
         self.mask = None
+        self.mask_u8 = None  # 0/1 perimeter mask, for multiplying straight into frames
+        self.mask_area = 0  # Pixel count of the perimeter, fixed once the mask is built
+        self.poly = None  # (N, 2) float32 perimeter vertices, for point_in_poly
+        self._points_np = None  # (N, 2) int32 perimeter vertices, for cv2 drawing calls
+        self.bbox = None  # (x0, y0, x1, y1) bounding box of the perimeter
+        self._overlay_cache = {}  # (obstructed, frame size) -> prerendered overlay layers
         self.drawing_complete = False
         
         # Monitoring state
         self.monitoring_active = False
         self.monitoring_thread = None
+        self.capture_thread = None
+        self.capture_interval = 1 / 30  # Minimum seconds between get_frame_callback calls
+        self.frames_captured = 0
+        self.frames_dropped = 0  # Captured frames replaced by a newer one before being checked
         self.stop_flag = threading.Event()
         self.lock = threading.Lock()
         
@@ -40,7 +90,33 @@ class PerimeterMonitor:
         
         # Background subtraction parameters
         self.min_contour_area = 1500  # Minimum contour area to consider as obstruction
-        self.difference_threshold = 45  # Pixel difference threshold
+        self.difference_threshold = 45  # Pixel difference threshold ('reference' method)
+        
+        # Background model: 'mog2' adapts to lighting drift, 'reference' diffs against one snapshot
+        self.method = 'mog2'
+        self.bg_sub = None
+        self.bg_learning_rate = 0.001  # Per checked frame
+        self._bg_lock = threading.Lock()  # Guards the background model and the analysis buffers
+        self._gpu = None  # (frame, mask, masked) GpuMats and stream when MOG2 runs on CUDA
+        self._ocl = False  # Analysis runs on UMats (OpenCL T-API) - no CUDA, but an OpenCL device
+        self._work_mask_umat = None
+        self._gray_umat = None  # Last checked gray frame on the OpenCL path, for _blend_reference
+        # 'reference' method: clear checks blend into a running average, so slow drift is absorbed
+        self.reference_alpha = 0.02  # Running-average weight of each clear check
+        self.reference_sync_every = 5  # Clear checks between refreshes of the uint8 reference
+        self._ref_f32 = None  # float32 running average behind reference_frame
+        self._ref_pending = 0  # Clear checks blended since the last refresh
+        
+        # Obstruction analysis runs on frames downsampled by this factor - min_contour_area
+        # already discards anything this loses, and the pixel pipeline touches ~1/9 of the bytes
+        self.analysis_scale = 0.33
+        self._work_roi = None  # (x0, y0, x1, y1) full-frame region analysed - the perimeter's bounding box
+        self._work_size = None  # (w, h) of the analysis frames
+        self._work_inv = None  # (x, y) analysis -> full-frame scale factors
+        self._work_mask = None  # 0/255 perimeter mask at analysis size
+        self._work_mask_area = 0
+        self._work_pct_scale = 0.0  # 100 / _work_mask_area: changed pixels -> percentage
+        self._bufs = None  # Preallocated analysis-size buffers, rewritten by every check
     
     def set_visible(self, visible: bool):
         """
@@ -67,25 +143,28 @@ class PerimeterMonitor:
         self.reset()
         
         temp_frame = frame.copy()
+        canvas = frame.copy()  # The open polyline so far - each click only adds its own segment
         drawing_active = True
         perimeter_complete = False
         
         def mouse_callback(event, x, y, flags, param):
-            nonlocal temp_frame
-            
             if event == cv2.EVENT_LBUTTONDOWN:
                 self.perimeter_points.append((x, y))
-                temp_frame = frame.copy()
-                self._draw_points_on_frame(temp_frame, closed=False)
-                cv2.imshow(window_name, temp_frame)
+                n = len(self.perimeter_points)
+                if n > 1:
+                    cv2.line(canvas, self.perimeter_points[-2], (x, y), (0, 255, 0), 2)
+                    self._draw_point_marker(canvas, n - 2, label=False)  # Previous marker back above the line
+                self._draw_point_marker(canvas, n - 1)
+                cv2.imshow(window_name, canvas)
                 if self.logger:
-                    self.logger.info(f"Point {len(self.perimeter_points)}: ({x}, {y})")
+                    self.logger.info(f"Point {n}: ({x}, {y})")
             
             elif event == cv2.EVENT_RBUTTONDOWN:
                 if len(self.perimeter_points) >= 3:
-                    temp_frame = frame.copy()
-                    self._draw_points_on_frame(temp_frame, closed=True)
-                    cv2.imshow(window_name, temp_frame)
+                    # Closing is a one-off, so the fill is drawn on a copy and the canvas stays open
+                    closed_frame = canvas.copy()
+                    self._close_points_on_frame(closed_frame)
+                    cv2.imshow(window_name, closed_frame)
                     if self.logger:
                         self.logger.info("Perimeter closed - Press ENTER to confirm")
         
@@ -154,97 +233,318 @@ class PerimeterMonitor:
         
         # Close polygon if requested
         if closed and len(self.perimeter_points) >= 3:
-            cv2.line(frame, self.perimeter_points[-1], 
-                    self.perimeter_points[0], (0, 255, 0), 2)
-            
-            # Semi-transparent fill
-            overlay = frame.copy()
-            pts = np.array(self.perimeter_points, dtype=np.int32)
-            cv2.fillPoly(overlay, [pts], (0, 255, 0))
-            cv2.addWeighted(overlay, 0.3, frame, 0.7, 0, frame)
+            self._close_points_on_frame(frame)
+            return
         
         # Draw points
-        for i, pt in enumerate(self.perimeter_points):
-            cv2.circle(frame, pt, 6, (0, 255, 0), -1)
-            cv2.circle(frame, pt, 8, (255, 255, 255), 2)
-            # Number the points
-            cv2.putText(frame, str(i+1), (pt[0]+10, pt[1]-10),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 2)
+        for i in range(len(self.perimeter_points)):
+            self._draw_point_marker(frame, i)
+    
+    def _close_points_on_frame(self, frame):
+        """Draw the closing line and semi-transparent fill over already-drawn points and lines"""
+        cv2.line(frame, self.perimeter_points[-1], 
+                self.perimeter_points[0], (0, 255, 0), 2)
+        
+        # Semi-transparent fill
+        overlay = frame.copy()
+        pts = np.array(self.perimeter_points, dtype=np.int32)
+        cv2.fillPoly(overlay, [pts], (0, 255, 0))
+        cv2.addWeighted(overlay, 0.3, frame, 0.7, 0, frame)
+        
+        # Points back on top of the fill
+        for i in range(len(self.perimeter_points)):
+            self._draw_point_marker(frame, i)
+    
+    def _draw_point_marker(self, frame, i, label=True):
+        """Draw perimeter point i, with its number unless label is False"""
+        pt = self.perimeter_points[i]
+        cv2.circle(frame, pt, 6, (0, 255, 0), -1)
+        cv2.circle(frame, pt, 8, (255, 255, 255), 2)
+        if not label:
+            return
+        # Number the points
+        cv2.putText(frame, str(i+1), (pt[0]+10, pt[1]-10),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 2)
     
     def _finalize_perimeter(self, frame):
         """Finalize perimeter setup"""
-        # Create mask
-        self.mask = np.zeros(frame.shape[:2], dtype=np.uint8)
-        points = np.array(self.perimeter_points, dtype=np.int32)
-        cv2.fillPoly(self.mask, [points], 255)
+        self._build_mask(frame.shape[:2])
         
         # Save reference frame (background)
-        self.reference_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        self._init_background(frame)
         self.drawing_complete = True
         
         # Calculate mask area for info
-        mask_area = cv2.countNonZero(self.mask)
         total_area = frame.shape[0] * frame.shape[1]
-        coverage = (mask_area / total_area) * 100
+        coverage = (self.mask_area / total_area) * 100
         if self.logger:
             self.logger.info(f"Perimeter covers {coverage:.1f}% of frame")
             self.logger.info("Background reference captured")
 
-    # SIMPLE BACKGROUND SUBTRACTION METHODS
-    def _check_obstruction_internal(self, current_frame) -> Tuple[bool, float]:
+    def _build_mask(self, shape):
+        """Rasterize the perimeter once into the 255 mask, the 0/1 mask and its bounding box"""
+        points = np.array(self.perimeter_points, dtype=np.int32)
+        x, y, w, h = cv2.boundingRect(points)
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + w, shape[1]), min(y + h, shape[0])
+        self.bbox = (x0, y0, x1, y1)
+        
+        self.mask = np.zeros(shape, dtype=np.uint8)
+        self.mask_u8 = np.zeros(shape, dtype=np.uint8)
+        xs, ys = points[:, 0], points[:, 1]
+        if len(points) == 4 and ((xs[0] == xs[1] and xs[2] == xs[3] and ys[1] == ys[2] and ys[3] == ys[0]) or
+                                 (ys[0] == ys[1] and ys[2] == ys[3] and xs[1] == xs[2] and xs[3] == xs[0])):
+            # Axis-aligned rectangle: the same pixels fillPoly would set, as one slice assignment
+            if x1 > x0 and y1 > y0:
+                self.mask[y0:y1, x0:x1] = 255
+                self.mask_u8[y0:y1, x0:x1] = 1
+            self.mask_area = max(x1 - x0, 0) * max(y1 - y0, 0)
+        else:
+            cv2.fillPoly(self.mask, [points], 255)
+            cv2.fillPoly(self.mask_u8, [points], 1)
+            self.mask_area = cv2.countNonZero(self.mask)
+        
+        self._points_np = points
+        self.poly = points.astype(np.float32)
+        self._overlay_cache = {}
+    
+    def _init_background(self, frame):
         """
-        Simple background subtraction for obstruction detection
+        Take frame as the background: the reference snapshot, and the seed of a fresh MOG2 model,
+        both at analysis size (the perimeter's bounding box, downsampled; the mask is cropped to match)
         """
-        if self.reference_frame is None or self.mask is None:
-            return False, 0.0
-        
-        try:
-            # Convert current frame to grayscale
-            current_gray = cv2.cvtColor(current_frame, cv2.COLOR_BGR2GRAY)
-            
-            # Ensure frame sizes match
-            if current_gray.shape != self.reference_frame.shape:
-                current_gray = cv2.resize(current_gray, 
-                                        (self.reference_frame.shape[1], self.reference_frame.shape[0]))
+        with self._bg_lock:
+            x0, y0, x1, y1 = self.bbox
+            if x1 <= x0 or y1 <= y0:  # Perimeter entirely off-frame - analyse the whole frame
+                x0, y0, (y1, x1) = 0, 0, self.mask.shape
+            self._work_roi = (x0, y0, x1, y1)
+            self._work_size = work_size = (max(1, round((x1 - x0) * self.analysis_scale)),
+                                           max(1, round((y1 - y0) * self.analysis_scale)))
+            self._work_inv = ((x1 - x0) / work_size[0], (y1 - y0) / work_size[1])
+            self._work_mask = cv2.resize(self.mask[y0:y1, x0:x1], work_size, interpolation=cv2.INTER_NEAREST)
+            self._work_mask_area = cv2.countNonZero(self._work_mask)
+            self._work_pct_scale = 100.0 / self._work_mask_area if self._work_mask_area else 0.0
             
-            # Step 1: Calculate absolute difference between current frame and reference
-            diff = cv2.absdiff(self.reference_frame, current_gray)
-            
-            # Step 2: Apply threshold to get binary image of changes
-            _, thresh = cv2.threshold(diff, self.difference_threshold, 255, cv2.THRESH_BINARY)
-            
-            # Step 3: Apply perimeter mask to focus only on the monitored area
-            masked_diff = cv2.bitwise_and(thresh, thresh, mask=self.mask)
-            
-            # Step 4: Find contours of the changed areas
-            contours, _ = cv2.findContours(masked_diff, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+            # Every stage of a check writes into these via dst=, so checks don't allocate
+            w, h = work_size
+            self._bufs = {
+                'small': np.empty((h, w, 3), dtype=np.uint8),
+                'gray': np.empty((h, w), dtype=np.uint8),
+                'diff': np.empty((h, w), dtype=np.uint8),
+                'fg': np.empty((h, w), dtype=np.uint8),
+                'masked': np.empty((h, w), dtype=np.uint8),
+                'labels': np.empty((h, w), dtype=np.int32),
+            }
             
-            # Step 5: Calculate total changed area within perimeter
-            total_changed_pixels = cv2.countNonZero(masked_diff)
-            mask_area = cv2.countNonZero(self.mask)
+            small = self._downsample(frame)
+            gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+            self._ocl = OPENCL_AVAILABLE and not CUDA_AVAILABLE and cv2.ocl.useOpenCL()
+            if self._ocl:
+                # The reference, its running average and the mask stay on the OpenCL device
+                self._work_mask_umat = cv2.UMat(self._work_mask)
+                self.reference_frame = cv2.UMat(gray)
+                self._ref_f32 = cv2.UMat(gray.astype(np.float32))
+            else:
+                self.reference_frame = gray
+                self._ref_f32 = gray.astype(np.float32)
+            self._ref_pending = 0
+            self.bg_sub = self._gpu = None
+            if self.method != 'mog2':
+                return
             
-            if mask_area == 0:
-                return False, 0.0
+            if CUDA_AVAILABLE:
+                # Per-pixel model update and masking on the GPU; only the binary mask comes back
+                try:
+                    stream = cv2.cuda_Stream()
+                    gpu = (cv2.cuda_GpuMat(), cv2.cuda_GpuMat(self._work_mask),
+                           cv2.cuda_GpuMat(h, w, cv2.CV_8UC1), stream)
+                    bg_sub = cv2.cuda.createBackgroundSubtractorMOG2(history=200, varThreshold=16,
+                                                                     detectShadows=False)
+                    gpu[0].upload(small, stream)
+                    bg_sub.apply(gpu[0], 1.0, stream)
+                    stream.waitForCompletion()
+                    self.bg_sub, self._gpu = bg_sub, gpu
+                    return
+                except cv2.error as e:
+                    if self.logger:
+                        self.logger.warning(f"CUDA MOG2 unavailable, using CPU: {e}")
             
-            # Calculate percentage of perimeter area that has changed
-            percentage = (total_changed_pixels / mask_area) * 100
+            self.bg_sub = cv2.createBackgroundSubtractorMOG2(history=200, varThreshold=16, detectShadows=False)
+            self.bg_sub.apply(cv2.UMat(small) if self._ocl else small, learningRate=1.0)
+    
+    def _downsample(self, frame):
+        """Crop a frame to the perimeter's bounding box and resize it to the analysis size"""
+        if frame.shape[:2] != self.mask.shape:
+            frame = cv2.resize(frame, (self.mask.shape[1], self.mask.shape[0]))
+        x0, y0, x1, y1 = self._work_roi
+        return cv2.resize(frame[y0:y1, x0:x1], self._work_size, dst=self._bufs['small'],
+                          interpolation=cv2.INTER_AREA)
+    
+    def _to_frame_coords(self, contour):
+        """Map an analysis-size contour back to perimeter (full frame) coordinates"""
+        return (contour * self._work_inv + self._work_roi[:2]).astype(np.int32)
+    
+    def _box_to_frame(self, box):
+        """Map an analysis-size component stats row back to a perimeter (full frame) x, y, w, h"""
+        sx, sy = self._work_inv
+        return (int(box[cv2.CC_STAT_LEFT] * sx) + self._work_roi[0],
+                int(box[cv2.CC_STAT_TOP] * sy) + self._work_roi[1],
+                int(box[cv2.CC_STAT_WIDTH] * sx), int(box[cv2.CC_STAT_HEIGHT] * sy))
+    
+    def contains(self, x, y):
+        """True if point (x, y), e.g. a detection's box centre, lies inside the perimeter"""
+        if self.poly is None:
+            return False
+        return bool(point_in_poly(self.poly, np.float32(x), np.float32(y)))
+    
+    def apply(self, frame):
+        """
+        Zero everything outside the perimeter inside its bounding box, in place
+        Returns the bounding-box view of frame - pixels outside the box are left untouched
+        """
+        if self.mask_u8 is None:
+            return frame
+        
+        x0, y0, x1, y1 = self.bbox
+        roi = frame[y0:y1, x0:x1]
+        mask = self.mask_u8[y0:y1, x0:x1]
+        if roi.ndim == 3:
+            mask = mask[:, :, None]
+        np.multiply(roi, mask, out=roi)
+        return roi
+
+    # SIMPLE BACKGROUND SUBTRACTION METHODS
+    def _foreground_mask(self, current_frame, learn=True):
+        """
+        Binary (0/255) image of the pixels inside the perimeter that differ from the background,
+        at analysis size. learn=False leaves the MOG2 model untouched.
+        The result is a shared buffer - call with _bg_lock held and use it before releasing.
+        """
+        bufs = self._bufs
+        current_frame = self._downsample(current_frame)
+        if self._ocl:
+            return self._foreground_mask_ocl(current_frame, learn)
+        
+        if self.method == 'mog2' and self.bg_sub is not None:
+            rate = self.bg_learning_rate if learn else 0.0
             
-            # Step 6: Check if any significant contours are found
-            significant_contours = []
-            for contour in contours:
-                area = cv2.contourArea(contour)
-                if area > self.min_contour_area:
-                    significant_contours.append(contour)
+            if self._gpu is not None:
+                gpu_frame, gpu_mask, gpu_masked, stream = self._gpu
+                gpu_frame.upload(current_frame, stream)
+                gpu_fg = self.bg_sub.apply(gpu_frame, rate, stream)
+                cv2.cuda.bitwise_and(gpu_fg, gpu_mask, gpu_masked, stream=stream)
+                gpu_masked.download(stream, bufs['masked'])
+                stream.waitForCompletion()
+                return bufs['masked']
             
-            # Obstruction detected if significant changes OR large percentage change
-            is_obstructed = (len(significant_contours) > 0 and percentage > 5) or percentage >= self.obstruction_threshold
+            fg = self.bg_sub.apply(current_frame, bufs['fg'], rate)
+            return cv2.bitwise_and(fg, self._work_mask, dst=bufs['masked'])
+        
+        # Convert current frame to grayscale
+        current_gray = cv2.cvtColor(current_frame, cv2.COLOR_BGR2GRAY, dst=bufs['gray'])
+        
+        # Calculate absolute difference between current frame and reference
+        diff = cv2.absdiff(self.reference_frame, current_gray, dst=bufs['diff'])
+        
+        # Confine to the perimeter first (a plain AND with the 0/255 mask), then threshold -
+        # the output is already mask-confined, with no separate masked-copy pass
+        cv2.bitwise_and(diff, self._work_mask, dst=diff)
+        _, masked_diff = cv2.threshold(diff, self.difference_threshold, 255, cv2.THRESH_BINARY,
+                                       dst=bufs['masked'])
+        return masked_diff
+    
+    def _foreground_mask_ocl(self, small, learn):
+        """
+        _foreground_mask on UMats, dispatched to OpenCL by the T-API: the same calls (MOG2 has
+        OpenCL kernels), with only the analysis-size binary mask downloaded
+        """
+        frame = cv2.UMat(small)
+        
+        if self.method == 'mog2' and self.bg_sub is not None:
+            fg = self.bg_sub.apply(frame, learningRate=self.bg_learning_rate if learn else 0.0)
+            return cv2.bitwise_and(fg, self._work_mask_umat).get()
+        
+        self._gray_umat = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        diff = cv2.absdiff(self.reference_frame, self._gray_umat)
+        diff = cv2.bitwise_and(diff, self._work_mask_umat)
+        return cv2.threshold(diff, self.difference_threshold, 255, cv2.THRESH_BINARY)[1].get()
+    
+    def _blend_reference(self):
+        """
+        Fold the last checked frame (still in the gray buffer) into the running-average reference,
+        refreshing the uint8 reference_frame every reference_sync_every blends. Call with _bg_lock held.
+        """
+        gray = self._gray_umat if self._ocl else self._bufs['gray']
+        cv2.accumulateWeighted(gray, self._ref_f32, self.reference_alpha)
+        self._ref_pending += 1
+        if self._ref_pending >= self.reference_sync_every:
+            self.reference_frame = cv2.convertScaleAbs(self._ref_f32, dst=self.reference_frame)
+            self._ref_pending = 0
+    
+    def _check_obstruction_internal(self, current_frame, return_contours=False, learn=True):
+        """
+        Simple background subtraction for obstruction detection
+        Returns (is_obstructed, percentage), or with return_contours also the significant
+        components and the label image (None when no blob could be significant), so overlays
+        reuse this pass. Each component is a connectedComponentsWithStats row
+        (LEFT, TOP, WIDTH, HEIGHT, AREA at analysis scale) with its label appended.
+        learn=False leaves the background (MOG2 model or running-average reference) untouched.
+        """
+        empty = (False, 0.0, np.empty((0, 6), dtype=np.int32), None) if return_contours else (False, 0.0)
+        if self.reference_frame is None or self.mask is None:
+            return empty
+        
+        try:
+            with self._bg_lock:
+                # Steps 1-3: Changed pixels within the perimeter (MOG2 or reference difference)
+                masked_diff = self._foreground_mask(current_frame, learn)
+                
+                # Step 4: Calculate total changed area within perimeter (countNonZero is already
+                # a vectorized reduction - bit-packing first for a popcount measured ~7x slower)
+                total_changed_pixels = cv2.countNonZero(masked_diff)
+                
+                if self._work_mask_area == 0:
+                    return empty
+                
+                # Calculate percentage of perimeter area that has changed
+                percentage = total_changed_pixels * self._work_pct_scale
+                
+                # Steps 5-6: Find significant blobs (area threshold at analysis scale). Labelling is
+                # skipped when the count alone decides: too few changed pixels for any blob to pass
+                # min_area (the usual clear frame), or already past the obstruction threshold
+                min_area = self.min_contour_area / (self._work_inv[0] * self._work_inv[1])
+                significant = stats = labels = None
+                if total_changed_pixels <= min_area:
+                    is_obstructed = percentage >= self.obstruction_threshold
+                elif percentage >= self.obstruction_threshold and not return_contours:
+                    is_obstructed = True
+                else:
+                    # Box and pixel area of every blob in one C pass; row 0 of stats is the background
+                    _, labels, stats, _ = cv2.connectedComponentsWithStats(
+                        masked_diff, labels=self._bufs['labels'], connectivity=8, ltype=cv2.CV_32S)
+                    significant = np.flatnonzero(stats[1:, cv2.CC_STAT_AREA] > min_area) + 1
+                    
+                    # Obstruction detected if significant changes OR large percentage change
+                    is_obstructed = (len(significant) > 0 and percentage > 5) or percentage >= self.obstruction_threshold
+                
+                # Step 7: A clear frame becomes part of the 'reference' background
+                if learn and not is_obstructed and self.bg_sub is None:
+                    self._blend_reference()
+                
+                if return_contours and labels is not None:
+                    labels = labels.copy()  # The buffer is reused by the next check
             
+            if return_contours:
+                if significant is None:
+                    return is_obstructed, percentage, empty[2], None
+                components = np.column_stack((stats[significant], significant)).astype(np.int32)
+                return is_obstructed, percentage, components, labels
             return is_obstructed, percentage
             
         except Exception as e:
             if self.logger:
                 self.logger.error(f"Background subtraction failed: {e}")
-            return False, 0.0
+            return empty
 
     def get_obstruction_visualization(self, current_frame):
         """
@@ -256,51 +556,42 @@ class PerimeterMonitor:
         
         try:
             # Create a multi-panel visualization
-            current_gray = cv2.cvtColor(current_frame, cv2.COLOR_BGR2GRAY)
-            
-            if current_gray.shape != self.reference_frame.shape:
-                current_gray = cv2.resize(current_gray, 
-                                        (self.reference_frame.shape[1], self.reference_frame.shape[0]))
+            if current_frame.shape[:2] != self.mask.shape:
                 current_frame = cv2.resize(current_frame, 
-                                         (self.reference_frame.shape[1], self.reference_frame.shape[0]))
+                                         (self.mask.shape[1], self.mask.shape[0]))
             
-            # Calculate difference
-            diff = cv2.absdiff(self.reference_frame, current_gray)
-            _, thresh = cv2.threshold(diff, self.difference_threshold, 255, cv2.THRESH_BINARY)
-            masked_diff = cv2.bitwise_and(thresh, thresh, mask=self.mask)
-            
-            # Find contours
-            contours, _ = cv2.findContours(masked_diff, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+            # One analysis pass (without training the background model on it)
+            _, percentage, components, labels = self._check_obstruction_internal(
+                current_frame, return_contours=True, learn=False)
             
             # Create visualization frame
             vis_frame = current_frame.copy()
             
             # Draw perimeter (always show in visualization mode)
-            points = np.array(self.perimeter_points, dtype=np.int32)
-            cv2.polylines(vis_frame, [points], True, (0, 255, 0), 2)
+            cv2.polylines(vis_frame, [self._points_np], True, (0, 255, 0), 2)
             
-            # Draw significant contours in red
-            for contour in contours:
-                area = cv2.contourArea(contour)
-                if area > self.min_contour_area:
-                    # Draw bounding box
-                    x, y, w, h = cv2.boundingRect(contour)
-                    cv2.rectangle(vis_frame, (x, y), (x + w, y + h), (0, 0, 255), 2)
-                    
-                    # Draw contour
-                    cv2.drawContours(vis_frame, [contour], -1, (0, 0, 255), 2)
-                    
-                    # Label with area
-                    cv2.putText(vis_frame, f"Area: {int(area)}", (x, y-10),
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 1)
+            # Draw significant components in red
+            area_scale = self._work_inv[0] * self._work_inv[1]
+            for component in components:
+                # Draw bounding box
+                x, y, w, h = self._box_to_frame(component)
+                cv2.rectangle(vis_frame, (x, y), (x + w, y + h), (0, 0, 255), 2)
+                
+                # Draw outline (traced inside the component's own box only)
+                left, top, cw, ch = component[:4]
+                blob = (labels[top:top + ch, left:left + cw] == component[5]).view(np.uint8)
+                outline, _ = cv2.findContours(blob, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_TC89_L1,
+                                              offset=(int(left), int(top)))
+                cv2.drawContours(vis_frame, [self._to_frame_coords(c) for c in outline], -1, (0, 0, 255), 2)
+                
+                # Label with area
+                area = component[cv2.CC_STAT_AREA] * area_scale
+                cv2.putText(vis_frame, f"Area: {int(area)}", (x, y-10),
+                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 1)
             
             # Add status text
-            total_changed = cv2.countNonZero(masked_diff)
-            mask_area = cv2.countNonZero(self.mask)
-            percentage = (total_changed / mask_area * 100) if mask_area > 0 else 0
-            
             status_color = (0, 0, 255) if percentage >= self.obstruction_threshold else (0, 255, 0)
-            status_text = f"Obstruction: {percentage:.1f}% ({len(contours)} contours)"
+            status_text = f"Obstruction: {percentage:.1f}% ({len(components)} contours)"
             
             cv2.putText(vis_frame, status_text, (10, 30),
                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, status_color, 2)
@@ -319,7 +610,7 @@ class PerimeterMonitor:
         """
         if self.drawing_complete:
             with self.lock:
-                self.reference_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+                self._init_background(frame)
             if self.logger:
                 self.logger.info("Background reference updated")
             return True
@@ -359,41 +650,23 @@ class PerimeterMonitor:
             obstructed = self.obstruction_detected
             pct = self.current_obstruction_pct
         
-        # Choose colors based on state
-        if obstructed:
-            color = (0, 0, 255)  # Red
-            status = "BREACH"
-        else:
-            color = (0, 255, 0)  # Green
-            status = "ACTIVE"
-        
         # Create a copy of the frame to avoid modifying the original
         result_frame = frame.copy()
         
-        # Draw perimeter polygon with filled background
-        points = np.array(self.perimeter_points, dtype=np.int32)
-        
-        # Draw filled polygon first (background)
-        overlay = result_frame.copy()
-        cv2.fillPoly(overlay, [points], color)
-        cv2.addWeighted(overlay, 0.15, result_frame, 0.85, 0, result_frame)
-        
-        # Draw perimeter outline
-        cv2.polylines(result_frame, [points], True, color, 3)
+        # The perimeter and panel only change with the state, so they are rendered once per
+        # state and composed here: a blend inside the polygon plus one masked copy
+        fill_box, fill, fill_mask, deco_box, deco, deco_mask = self._overlay_layers(obstructed, frame.shape[:2])
         
-        # Draw corner points
-        for pt in self.perimeter_points:
-            cv2.circle(result_frame, pt, 6, color, -1)
-            cv2.circle(result_frame, pt, 8, (255, 255, 255), 2)
+        # Filled polygon background at 15% opacity
+        x0, y0, x1, y1 = fill_box
+        if fill_mask.size:
+            roi = result_frame[y0:y1, x0:x1]
+            blended = cv2.addWeighted(roi, 0.85, fill, 0.15, 0)
+            cv2.copyTo(blended, fill_mask, roi)
         
-        # Status panel background - draw once per state change
-        panel_height = 80 if obstructed else 60
-        cv2.rectangle(result_frame, (5, 5), (350, panel_height), (0, 0, 0), -1)
-        cv2.rectangle(result_frame, (5, 5), (350, panel_height), color, 2)
-        
-        # Status text
-        cv2.putText(result_frame, f"PERIMETER: {status}", (15, 30),
-                cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
+        # Outline, corner points and status panel
+        x0, y0, x1, y1 = deco_box
+        cv2.copyTo(deco, deco_mask, result_frame[y0:y1, x0:x1])
         
         # Obstruction percentage (only when obstructed)
         if obstructed:
@@ -402,6 +675,50 @@ class PerimeterMonitor:
         
         return result_frame
 
+    def _overlay_layers(self, obstructed, shape):
+        """
+        Render the static parts of draw_overlay for one state and frame size, cached until the
+        perimeter changes: the polygon fill colour and mask inside its bounding box, and the
+        outline/points/status panel layer with its mask inside theirs
+        """
+        key = (obstructed, shape)
+        layers = self._overlay_cache.get(key)
+        if layers is not None:
+            return layers
+        
+        color = (0, 0, 255) if obstructed else (0, 255, 0)
+        status = "BREACH" if obstructed else "ACTIVE"
+        points = self._points_np
+        
+        poly_mask = np.zeros(shape, dtype=np.uint8)
+        cv2.fillPoly(poly_mask, [points], 255)
+        x, y, w, h = cv2.boundingRect(poly_mask)
+        fill_box = (x, y, x + w, y + h)
+        fill = np.empty((h, w, 3), dtype=np.uint8)
+        fill[:] = color
+        fill_mask = poly_mask[y:y + h, x:x + w].copy()
+        
+        # Drawn twice with the same geometry: in colour, and as 255 into the mask
+        deco = np.zeros(shape + (3,), dtype=np.uint8)
+        deco_mask = np.zeros(shape, dtype=np.uint8)
+        panel_height = 80 if obstructed else 60
+        for img, paint in ((deco, lambda c: c), (deco_mask, lambda c: 255)):
+            cv2.polylines(img, [points], True, paint(color), 3)
+            for pt in self.perimeter_points:
+                cv2.circle(img, pt, 6, paint(color), -1)
+                cv2.circle(img, pt, 8, paint((255, 255, 255)), 2)
+            cv2.rectangle(img, (5, 5), (350, panel_height), paint((0, 0, 0)), -1)
+            cv2.rectangle(img, (5, 5), (350, panel_height), paint(color), 2)
+            cv2.putText(img, f"PERIMETER: {status}", (15, 30),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, paint(color), 2)
+        x, y, w, h = cv2.boundingRect(deco_mask)
+        deco_box = (x, y, x + w, y + h)
+        
+        layers = (fill_box, fill, fill_mask, deco_box,
+                  deco[y:y + h, x:x + w].copy(), deco_mask[y:y + h, x:x + w].copy())
+        self._overlay_cache[key] = layers
+        return layers
+
     def draw_minimal_overlay(self, frame):
         """
         Draw only obstruction boxes without perimeter outline
@@ -411,34 +728,22 @@ class PerimeterMonitor:
             return frame
         
         try:
-            # Check for obstructions and draw boxes if found
-            obstructed, percentage = self._check_obstruction_internal(frame)
+            # Check for obstructions (without training the background model on a drawing call) -
+            # the same pass yields the component boxes to draw
+            obstructed, percentage, components, _ = self._check_obstruction_internal(
+                frame, return_contours=True, learn=False)
             
             if obstructed:
-                # Convert to grayscale for detection
-                current_gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-                
-                if current_gray.shape != self.reference_frame.shape:
-                    current_gray = cv2.resize(current_gray, 
-                                            (self.reference_frame.shape[1], self.reference_frame.shape[0]))
+                if frame.shape[:2] != self.mask.shape:
                     frame = cv2.resize(frame, 
-                                     (self.reference_frame.shape[1], self.reference_frame.shape[0]))
+                                     (self.mask.shape[1], self.mask.shape[0]))
                 
-                # Calculate difference and find contours
-                diff = cv2.absdiff(self.reference_frame, current_gray)
-                _, thresh = cv2.threshold(diff, self.difference_threshold, 255, cv2.THRESH_BINARY)
-                masked_diff = cv2.bitwise_and(thresh, thresh, mask=self.mask)
-                
-                contours, _ = cv2.findContours(masked_diff, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-                
-                # Draw bounding boxes for significant contours
-                for contour in contours:
-                    area = cv2.contourArea(contour)
-                    if area > self.min_contour_area:
-                        x, y, w, h = cv2.boundingRect(contour)
-                        cv2.rectangle(frame, (x, y), (x + w, y + h), (0, 0, 255), 2)
-                        cv2.putText(frame, "OBSTRUCTION", (x, y-10),
-                                  cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 1)
+                # Draw bounding boxes for significant components
+                for component in components:
+                    x, y, w, h = self._box_to_frame(component)
+                    cv2.rectangle(frame, (x, y), (x + w, y + h), (0, 0, 255), 2)
+                    cv2.putText(frame, "OBSTRUCTION", (x, y-10),
+                              cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 1)
             
             return frame
             
@@ -476,19 +781,15 @@ class PerimeterMonitor:
                 self.logger.error("Cannot finalize - need at least 3 perimeter points")
             return False
         
-        # Create mask
-        self.mask = np.zeros(frame.shape[:2], dtype=np.uint8)
-        points = np.array(self.perimeter_points, dtype=np.int32)
-        cv2.fillPoly(self.mask, [points], 255)
+        self._build_mask(frame.shape[:2])
         
         # Save reference frame (background)
-        self.reference_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        self._init_background(frame)
         self.drawing_complete = True
         
         # Calculate mask area for info
-        mask_area = cv2.countNonZero(self.mask)
         total_area = frame.shape[0] * frame.shape[1]
-        coverage = (mask_area / total_area) * 100
+        coverage = (self.mask_area / total_area) * 100
         if self.logger:
             self.logger.info(f"Perimeter covers {coverage:.1f}% of frame")
         
@@ -537,6 +838,26 @@ class PerimeterMonitor:
         self.check_interval = check_interval
         self.monitoring_active = True
         self.stop_flag.clear()
+        self.frames_captured = 0
+        self.frames_dropped = 0
+        
+        # Latest-frame holder: a slow frame source never stalls the checks, and a slow check
+        # never backs frames up - whatever arrived in between is simply replaced
+        latest = [None, 0]  # frame, frame id
+        latest_lock = threading.Lock()
+        
+        def capture_loop():
+            while not self.stop_flag.is_set():
+                try:
+                    frame = get_frame_callback()
+                    if frame is not None:
+                        with latest_lock:
+                            latest[0] = frame
+                            latest[1] += 1
+                except Exception as e:
+                    if self.logger:
+                        self.logger.error(f"Frame capture error: {e}")
+                self.stop_flag.wait(self.capture_interval)
         
         def monitoring_loop():
             if self.logger:
@@ -544,14 +865,21 @@ class PerimeterMonitor:
             last_state = False
             consecutive_detections = 0
             required_consecutive = 2
+            last_frame_id = 0
             
-            while self.monitoring_active and not self.stop_flag.is_set():
+            # stop_flag.wait() doubles as the pacing sleep and returns True as soon as a stop is requested
+            while True:
                 try:
-                    # Get current frame
-                    frame = get_frame_callback()
-                    if frame is None:
-                        time.sleep(self.check_interval)
+                    # Take the newest captured frame, skipping the check if nothing new arrived
+                    with latest_lock:
+                        frame, frame_id = latest
+                    if frame_id == last_frame_id:
+                        if self.stop_flag.wait(self.check_interval):
+                            break
                         continue
+                    self.frames_captured = frame_id
+                    self.frames_dropped += frame_id - last_frame_id - 1
+                    last_frame_id = frame_id
                     
                     # Check obstruction using background subtraction
                     obstructed, percentage = self._check_obstruction_internal(frame)
@@ -589,16 +917,21 @@ class PerimeterMonitor:
                         
                         last_state = current_state
                     
-                    time.sleep(self.check_interval)
+                    if self.stop_flag.wait(self.check_interval):
+                        break
                     
                 except Exception as e:
                     if self.logger:
                         self.logger.error(f"Monitoring loop error: {e}")
-                    time.sleep(self.check_interval)
+                    if self.stop_flag.wait(self.check_interval):
+                        break
             
             if self.logger:
-                self.logger.info("🛑 Perimeter monitoring stopped")
+                self.logger.info(f"🛑 Perimeter monitoring stopped ({self.frames_captured} frames captured, "
+                                 f"{self.frames_dropped} dropped unchecked)")
         
+        self.capture_thread = threading.Thread(target=capture_loop, daemon=True)
+        self.capture_thread.start()
         self.monitoring_thread = threading.Thread(target=monitoring_loop, daemon=True)
         self.monitoring_thread.start()
         return True
@@ -614,7 +947,9 @@ class PerimeterMonitor:
         self.stop_flag.set()
         
         if self.monitoring_thread:
-            self.monitoring_thread.join(timeout=2.0)
+            self.monitoring_thread.join()  # Wakes from stop_flag.wait() immediately
+        if self.capture_thread:
+            self.capture_thread.join(timeout=2.0)  # May be inside a blocking get_frame_callback()
         
         with self.lock:
             self.obstruction_detected = False
@@ -659,11 +994,14 @@ class PerimeterMonitor:
                 'monitoring': self.monitoring_active,
                 'obstructed': self.obstruction_detected,
                 'obstruction_pct': self.current_obstruction_pct,
+                'frames_captured': self.frames_captured,
+                'frames_dropped': self.frames_dropped,
                 'point_count': len(self.perimeter_points),
                 'threshold': self.obstruction_threshold,
                 'visible': self.visible,
                 'show_detection_boxes': self.show_detection_boxes,
-                'method': 'background_subtraction'
+                'method': 'background_subtraction',
+                'background_model': self.method
             }
     
     def reset(self):
@@ -672,8 +1010,22 @@ class PerimeterMonitor:
         
         with self.lock:
             self.reference_frame = None
+            self._ref_f32 = None
+            self._work_mask_umat = None
+            self._gray_umat = None
+            self.bg_sub = None
+            self._gpu = None
             self.perimeter_points = []
             self.mask = None
+            self.mask_u8 = None
+            self.mask_area = 0
+            self._work_mask = None
+            self._work_mask_area = 0
+            self._work_pct_scale = 0.0
+            self._bufs = None
+            self.poly = None
+            self._points_np = None
+            self.bbox = None
             self.drawing_complete = False
             self.obstruction_detected = False
             self.current_obstruction_pct = 0.0
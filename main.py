@@ -4,13 +4,54 @@ from tkinter import ttk, filedialog, messagebox
 import time
 import os
 import sys
-import cv2
-from PIL import Image, ImageTk
+import errno
+import signal
+import functools
 import threading
-import numpy as np
+import asyncio
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+# Heavy modules are imported by load_heavy_modules() once the splash is on screen
+cv2 = None
+np = None
+Image = None
+ImageTk = None
+ffmpegcv = None
+FFMPEGCV_AVAILABLE = False
+CAMERA_BACKEND = None
 
 APP_ROOT   = os.path.dirname(os.path.abspath(__file__))
 ICON_PATH  = os.path.join(APP_ROOT, 'icon.ico')
+# Live previews go to a native OpenGL window when OpenCV supports it; AQUASENSE_PREVIEW=tk keeps them in Tk
+PREVIEW_WINDOW = "AquaSense Preview"
+
+def load_heavy_modules():
+    """
+    Import OpenCV, NumPy and PIL into the module globals
+    Deferred so the splash window paints before these (slow) imports run; safe to call repeatedly
+    """
+    global cv2, np, Image, ImageTk, ffmpegcv, FFMPEGCV_AVAILABLE, CAMERA_BACKEND
+    if cv2 is not None:
+        return
+        
+    import numpy
+    import cv2 as _cv2
+    from PIL import Image as _Image, ImageTk as _ImageTk
+    np, Image, ImageTk = numpy, _Image, _ImageTk
+    
+    # Optional NVDEC (GPU) video decoding for file previews
+    try:
+        import ffmpegcv as _ffmpegcv
+        ffmpegcv, FFMPEGCV_AVAILABLE = _ffmpegcv, True
+    except ImportError:
+        FFMPEGCV_AVAILABLE = False
+        
+    # DirectShow opens cameras much faster than the default MSMF backend on Windows
+    CAMERA_BACKEND = _cv2.CAP_DSHOW if os.name == 'nt' else _cv2.CAP_ANY
+    cv2 = _cv2  # Assigned last: it doubles as the "already loaded" flag
+
+
 def set_window_icon(window: tk.Tk):
     if os.path.isfile(ICON_PATH):
         try:
@@ -19,8 +60,20 @@ def set_window_icon(window: tk.Tk):
             pass
 
 # ENHANCED Port Cleaner Functionality
-def cleanup_ports():
-    """Close any open serial ports with enhanced error handling"""
+PORT_CACHE_SECONDS = 5.0
+_port_cache = (0.0, None)  # (monotonic timestamp, (available_ports, locked_ports))
+
+def cleanup_ports(force=False):
+    """
+    Close any open serial ports with enhanced error handling
+    Results are cached for PORT_CACHE_SECONDS since every screen transition calls this.
+    force=True bypasses the cache and also tries to kill processes holding locked ports.
+    """
+    global _port_cache
+    cached_at, cached = _port_cache
+    if not force and cached is not None and time.monotonic() - cached_at < PORT_CACHE_SECONDS:
+        return cached
+    
     try:
         import serial
         from serial.tools import list_ports
@@ -38,29 +91,17 @@ def cleanup_ports():
                 available_ports.append(port.device)
                 print(f"✅ {port.device} is available")
             except serial.SerialException as e:
-                if "Access is denied" in str(e) or "PermissionError" in str(e):
+                # Windows reports a held COM port as access denied, Linux as a busy tty
+                if ("Access is denied" in str(e) or "PermissionError" in str(e) or
+                        getattr(e, 'errno', None) == errno.EBUSY):
                     locked_ports.append(port.device)
                     print(f"❌ {port.device} is locked - close Arduino IDE and other apps")
-                    # Try to force close with different method
-                    try:
-                        # Alternative method to release port
-                        import subprocess
-                        if os.name == 'nt':  # Windows
-                            # Try to find and kill processes using the port
-                            result = subprocess.run(['netstat', '-ano'], capture_output=True, text=True)
-                            for line in result.stdout.split('\n'):
-                                if port.device in line:
-                                    parts = line.split()
-                                    if len(parts) > 4:
-                                        pid = parts[4]
-                                        subprocess.run(['taskkill', '/F', '/PID', pid], 
-                                                     capture_output=True)
-                        print(f"   Attempted to force release {port.device}")
-                    except Exception as force_error:
-                        print(f"   Could not force release {port.device}: {force_error}")
                 else:
                     print(f"⚠️ {port.device}: {e}")
         
+        if force and locked_ports:
+            release_locked_ports(locked_ports)
+        
         # Summary
         if locked_ports:
             print(f"🚫 Locked ports detected: {', '.join(locked_ports)}")
@@ -72,6 +113,7 @@ def cleanup_ports():
         if not ports:
             print("ℹ️ No serial ports found")
             
+        _port_cache = (time.monotonic(), (available_ports, locked_ports))
         return available_ports, locked_ports
         
     except ImportError:
@@ -81,6 +123,297 @@ def cleanup_ports():
         print(f"⚠️ Port cleanup error: {e}")
         return [], []
 
+def release_locked_ports(locked_ports):
+    """
+    Kill the processes holding the given serial devices, found in a single /proc/<pid>/fd scan
+    Windows (and macOS) don't expose other processes' device handles, so there it only reports the lock.
+    """
+    if not os.path.isdir('/proc'):
+        print("   Locked serial ports can't be traced to a process here - close the app holding them")
+        return
+        
+    # fd links point at the resolved device, while ports may be given as /dev/serial/by-id links
+    wanted = {os.path.realpath(port): port for port in locked_ports}
+    own_pid = os.getpid()
+    for pid in os.listdir('/proc'):
+        if not pid.isdigit() or int(pid) == own_pid:
+            continue
+        fd_dir = f'/proc/{pid}/fd'
+        held = set()
+        try:
+            for fd in os.listdir(fd_dir):
+                target = os.readlink(os.path.join(fd_dir, fd))
+                if target in wanted:
+                    held.add(wanted[target])
+        except OSError:
+            continue  # Exited meanwhile, or not ours to inspect
+        if held:
+            try:
+                with open(f'/proc/{pid}/comm') as f:
+                    name = f.read().strip()
+            except OSError:
+                name = '?'
+            try:
+                os.kill(int(pid), signal.SIGKILL)
+                print(f"   Killed {name} (PID {pid}) holding {', '.join(sorted(held))}")
+            except OSError as kill_error:
+                print(f"   Could not release {', '.join(sorted(held))}: {kill_error}")
+
+class NVDecCapture:
+    """
+    cv2.VideoCapture-compatible wrapper around ffmpegcv.VideoCaptureNV
+    Covers only what the preview uses: grab/retrieve/read, rewinding and the FPS property
+    """
+    def __init__(self, path):
+        self.path = path
+        self.cap = ffmpegcv.VideoCaptureNV(path)
+        self.frame = None
+        
+    def isOpened(self):
+        return self.cap.isOpened()
+        
+    def grab(self):
+        # NVDEC decodes every frame on the GPU anyway, so grab keeps the decoded frame
+        ret, self.frame = self.cap.read()
+        return ret
+        
+    def retrieve(self):
+        return self.frame is not None, self.frame
+        
+    def read(self):
+        return self.grab(), self.frame
+        
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_FPS:
+            return float(getattr(self.cap, 'fps', 0.0))
+        return 0.0
+        
+    def set(self, prop, value):
+        # ffmpegcv streams can't seek - rewinding means reopening the file
+        if prop == cv2.CAP_PROP_POS_FRAMES and value == 0:
+            self.cap.release()
+            self.cap = ffmpegcv.VideoCaptureNV(self.path)
+            return True
+        return False
+        
+    def release(self):
+        self.cap.release()
+
+def open_video_file(path):
+    """Open a video file with NVDEC GPU decoding when available, OpenCV otherwise"""
+    if FFMPEGCV_AVAILABLE:
+        try:
+            cap = NVDecCapture(path)
+            if cap.isOpened():
+                return cap
+            cap.release()
+        except Exception as e:
+            print(f"NVDEC decode unavailable, using OpenCV: {e}")
+    return cv2.VideoCapture(path)
+
+def open_camera(index):
+    """
+    Open a live camera tuned for low latency: 1-frame driver buffer, MJPG at 640x480 @ 30 FPS
+    MJPG keeps USB bandwidth low and capturing at the processing size avoids a resize per frame.
+    """
+    cap = cv2.VideoCapture(index, CAMERA_BACKEND)
+    if cap.isOpened():
+        # FOURCC first - some drivers only accept the resolution once the format is set
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+        cap.set(cv2.CAP_PROP_FPS, 30)
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Keep only the newest frame queued
+    return cap
+
+@functools.lru_cache(maxsize=64)
+def _text_sprite(text, scale, color, thickness):
+    """Rasterize overlay text once: solid-colour patch, binary glyph mask and baseline offset"""
+    (tw, th), baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, scale, thickness)
+    pad = thickness * 2
+    sprite = np.zeros((th + baseline + 2 * pad, tw + 2 * pad, 3), dtype=np.uint8)
+    cv2.putText(sprite, text, (pad, pad + th), cv2.FONT_HERSHEY_SIMPLEX, scale, color, thickness)
+    mask = (sprite.max(axis=2) >= max(color) // 2).astype(np.uint8)
+    sprite[:] = color
+    return sprite, mask, pad + th, pad
+
+def draw_text(frame, text, org, scale, color, thickness):
+    """
+    cv2.putText replacement for overlay text that repeats frame after frame
+    Glyphs are rasterized once per distinct string; each call is a masked copy of the cached sprite.
+    """
+    sprite, mask, oy, ox = _text_sprite(text, scale, color, thickness)
+    x0, y0 = org[0] - ox, org[1] - oy
+    h, w = mask.shape
+    fx0, fy0 = max(x0, 0), max(y0, 0)
+    fx1, fy1 = min(x0 + w, frame.shape[1]), min(y0 + h, frame.shape[0])
+    if fx0 >= fx1 or fy0 >= fy1:
+        return
+    sx, sy = fx0 - x0, fy0 - y0
+    cv2.copyTo(sprite[sy:sy + fy1 - fy0, sx:sx + fx1 - fx0],
+               mask[sy:sy + fy1 - fy0, sx:sx + fx1 - fx0],
+               frame[fy0:fy1, fx0:fx1])
+
+class FrameSlot:
+    """
+    Single-slot frame buffer between one producer and one consumer
+    The buffer is allocated once and overwritten in place; stamp counts the frames written.
+    """
+    def __init__(self):
+        self.buf = None
+        self.stamp = 0
+        self._cond = threading.Condition(threading.Lock())
+        
+    def write(self, frame):
+        with self._cond:
+            if self.buf is None or self.buf.shape != frame.shape:
+                self.buf = np.empty_like(frame)
+            np.copyto(self.buf, frame)
+            self.stamp += 1
+            self._cond.notify_all()
+            
+    def read(self, newer_than=0, timeout=None):
+        """
+        Return (stamp, copy of the newest frame) once a frame newer than stamp newer_than
+        has been written, or (0, None) if none arrives within timeout
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self.stamp > newer_than, timeout):
+                return 0, None
+            return self.stamp, self.buf.copy()
+
+class CameraFeed:
+    """
+    Keeps an already-open camera capture streaming on its own thread into a FrameSlot
+    Lets the monitor take over the setup preview's capture instead of reopening the device.
+    read() mirrors cv2.VideoCapture.read() and only ever returns each camera frame once.
+    """
+    def __init__(self, cap):
+        self.cap = cap
+        self.slot = FrameSlot()
+        self._last_stamp = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self._thread.start()
+        
+    def _capture_loop(self):
+        while not self._stop.is_set():
+            ret, frame = self.cap.read()
+            if ret:
+                self.slot.write(frame)
+            else:
+                self._stop.wait(0.01)  # Camera hiccup - don't spin
+                
+    def isOpened(self):
+        return self.cap.isOpened()
+        
+    def read(self, timeout=0.1):
+        """Wait for a frame the camera hasn't delivered before - a consumer polling faster than
+        the sensor gets (False, None) instead of the same frame again"""
+        stamp, frame = self.slot.read(self._last_stamp, timeout)
+        if stamp:
+            self._last_stamp = stamp
+        return stamp > 0, frame
+        
+    def release(self):
+        self._stop.set()
+        self._thread.join(timeout=1.0)
+        self.cap.release()
+
+class _DemoCapture:
+    """
+    Stand-in for cv2.VideoCapture when no camera or video is available
+    The static captions are rendered once into a template; read() copies it and draws the moving box.
+    Frames rotate through a small ring so the one the detector is still using isn't overwritten.
+    """
+    __slots__ = ('_base', '_frames', '_i')
+    
+    def __init__(self, ring=3):
+        self._base = np.zeros((480, 640, 3), dtype=np.uint8)
+        cv2.putText(self._base, "DEMO MODE", (50, 50), 
+                   cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+        cv2.putText(self._base, "AquaSense-AI Monitoring", (50, 100), 
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 1)
+        self._frames = [np.empty_like(self._base) for _ in range(ring)]
+        self._i = 0
+        
+    def read(self):
+        frame = self._frames[self._i % len(self._frames)]
+        np.copyto(frame, self._base)
+        
+        # Moving elements
+        x = (self._i * 5) % 500
+        cv2.rectangle(frame, (x, 150), (x + 100, 250), (0, 255, 0), 2)
+        
+        self._i += 1
+        return True, frame
+        
+    def isOpened(self):
+        return True
+        
+    def release(self):
+        pass
+        
+    def set(self, prop, value):
+        return True
+
+class AlertStateMachine:
+    """
+    Drowning/obstruction alert state, advanced once per frame with step()
+    step() returns the edge events of that frame - usually none - so the caller only acts on
+    transitions. Obstruction takes priority over drowning and is held for at least min_ns.
+    """
+    NORMAL = 'normal'
+    DROWNING = 'drowning'
+    OBSTRUCTED = 'obstructed'
+    OBSTR_HOLDING = 'obstr_holding'  # Obstruction gone but not yet held for min_ns
+    
+    def __init__(self, min_ns):
+        self.min_ns = min_ns
+        self.reset()
+        
+    def reset(self):
+        self.state = self.NORMAL
+        self.obstruction_start_ns = 0
+        
+    @property
+    def obstruction_active(self):
+        return self.state is self.OBSTRUCTED or self.state is self.OBSTR_HOLDING
+        
+    def step(self, detected, obstructed, now):
+        state = self.state
+        if obstructed:
+            if state is self.OBSTRUCTED or state is self.OBSTR_HOLDING:
+                self.state = self.OBSTRUCTED
+                return ()
+            events = ['drowning_overridden'] if state is self.DROWNING else []
+            events.append('obstruction_started')
+            self.obstruction_start_ns = now
+            self.state = self.OBSTRUCTED
+            print("🚨 Initial obstruction detection")
+            return events
+        
+        events = []
+        if state is self.OBSTRUCTED or state is self.OBSTR_HOLDING:
+            obstruction_ns = now - self.obstruction_start_ns
+            if obstruction_ns < self.min_ns:
+                # Brief obstruction - keep the obstructed state, don't signal again
+                self.state = self.OBSTR_HOLDING
+                return ()
+            events.append('obstruction_cleared')
+            state = self.state = self.NORMAL
+            print(f"✅ Obstruction cleared after {obstruction_ns / 1e9:.1f} seconds")
+        
+        if detected and state is self.NORMAL:
+            events.append('drowning_started')
+            self.state = self.DROWNING
+            print("Drowning alert sent - continuous tone")
+        elif not detected and state is self.DROWNING:
+            events.append('drowning_cleared')
+            self.state = self.NORMAL
+            print("Drowning alert cleared")
+        return events
+
 class SplashScreen:
     def __init__(self):
         self.root = tk.Tk()
@@ -139,26 +472,64 @@ class SplashScreen:
     def update_progress(self, value, status):
         self.progress_var.set(value)
         self.status_label.config(text=status)
-        self.root.update()
         
     def close(self):
         self.root.destroy()
         
-    def run_loading(self):
-        """Run loading sequence"""
+    def load_modules(self):
+        """Import the heavy modules and compile the preview kernel behind the splash"""
+        load_heavy_modules()
+        try:
+            from core import preview_kernel
+            preview_kernel.warm_up()
+        except Exception as e:
+            print(f"Preview kernel warm-up skipped: {e}")
+        try:
+            import core.perimeter  # Compiles (or loads) the point-in-polygon kernel
+        except Exception as e:
+            print(f"Perimeter module not preloaded: {e}")
+            
+    def load_serial(self):
+        """Import pyserial's port enumeration used by the setup screens"""
+        try:
+            from serial.tools import list_ports
+        except ImportError as e:
+            print(f"Serial support unavailable: {e}")
+            
+    def load_detection(self):
+        """Import the detector stack so the monitor screen doesn't pay for it"""
+        try:
+            import detect
+            from ultralytics import YOLO
+        except Exception as e:
+            print(f"Detection modules not preloaded: {e}")
+        
+    def _step(self, value, status):
+        """Post a progress update from the loading thread to the Tk thread"""
+        self.root.after(0, self.update_progress, value, status)
+        
+    def _do_loading(self):
+        """Loading thread - the progress bar advances as each piece of real work completes"""
         steps = [
-            (10, "Initializing UI..."),
-            (30, "Loading modules..."),
-            (60, "Checking cameras..."),
-            (80, "Setting up detection..."),
-            (100, "Ready!")
+            (30, "Loading modules...", self.load_modules),
+            (60, "Checking serial ports...", self.load_serial),
+            (80, "Setting up detection...", self.load_detection),
         ]
         
-        for value, status in steps:
-            self.update_progress(value, status)
-            time.sleep(0.3)
-            
-        time.sleep(0.5)
+        try:
+            for value, status, action in steps:
+                action()
+                self._step(value, status)
+            self._step(100, "Ready!")
+        finally:
+            # Always hand control back, even if a step failed
+            self.root.after(0, self.root.quit)
+        
+    def run_loading(self):
+        """Run loading sequence; returns once the loading thread has finished"""
+        self.update_progress(10, "Initializing UI...")
+        threading.Thread(target=self._do_loading, daemon=True).start()
+        self.root.mainloop()
         return True
 
 class MainMenu:
@@ -265,6 +636,7 @@ class MainMenu:
 
 class SetupScreen:
     def __init__(self, mode='live'):
+        load_heavy_modules()  # No-op when the splash already loaded them
         self.mode = mode
         self.root = tk.Tk()
         self.root.title(f"AquaSense-AI - {mode.upper()} Mode Setup")
@@ -277,6 +649,18 @@ class SetupScreen:
         self.confidence = 0.5
         self.preview_running = False
         self.camera_cap = None
+        self._preview_after_id = None  # Pending Tk timer driving the preview
+        
+        # Preallocated 600x400 preview buffers (OpenCV writes into them via dst=)
+        self._resize_buf = np.empty((400, 600, 3), dtype=np.uint8)
+        self._rgb_buf = np.empty_like(self._resize_buf)
+        self._last_frame = None  # Last full-size camera frame painted, for perimeter drawing
+        self._native_preview = False  # True while the live preview is in the OpenGL window
+        try:
+            from core.preview_kernel import bgr_to_rgb
+            self._bgr_to_rgb = bgr_to_rgb
+        except ImportError:
+            self._bgr_to_rgb = lambda src, dst: cv2.cvtColor(src, cv2.COLOR_BGR2RGB, dst=dst)
         
         # Initialize components
         self.model_path_var = tk.StringVar()
@@ -310,6 +694,60 @@ class SetupScreen:
             
         self.setup_ui()
         
+        # One long-lived event loop thread runs all of this screen's background device work
+        self._aio_loop = asyncio.new_event_loop()
+        threading.Thread(target=self._aio_loop.run_forever, daemon=True).start()
+        
+        # Populate the port and camera lists in the background so the window shows immediately
+        self._run_async(self._probe_devices())
+        
+    def _run_async(self, coro):
+        """Schedule a coroutine on the screen's event loop thread"""
+        return asyncio.run_coroutine_threadsafe(coro, self._aio_loop)
+        
+    def _to_ui(self, callback, *args):
+        """Hand a result back to the Tk thread; ignored once the window is gone"""
+        try:
+            self.root.after(0, callback, *args)
+        except (RuntimeError, tk.TclError):
+            pass
+        
+    async def _probe_devices(self):
+        """Probe serial ports and cameras concurrently, then fill the combos on the Tk thread"""
+        loop = asyncio.get_running_loop()
+        probe_ports = self.bt_available and hasattr(self, 'serial_combo')
+        probe_cameras = self.mode == 'live'
+        try:
+            ports, cameras = await asyncio.gather(
+                loop.run_in_executor(None, self.bt.list_ports) if probe_ports else asyncio.sleep(0),
+                loop.run_in_executor(None, self._probe_cameras) if probe_cameras else asyncio.sleep(0))
+        except Exception as e:
+            print(f"Device probe error: {e}")
+            return
+            
+        if probe_ports:
+            self._to_ui(self._apply_serial_ports, ports)
+        if probe_cameras:
+            self._to_ui(self._apply_cameras, cameras)
+        
+    def _refresh_async(self, button, probe, apply):
+        """Run a refresh button's device probe on the event loop, with the button disabled meanwhile"""
+        button.config(state=tk.DISABLED)
+        self._run_async(self._refresh(button, probe, apply))
+        
+    async def _refresh(self, button, probe, apply):
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(None, probe)
+        except Exception as e:
+            print(f"Device probe error: {e}")
+            result = None
+        self._to_ui(self._finish_refresh, button, apply, result)
+        
+    def _finish_refresh(self, button, apply, result):
+        button.config(state=tk.NORMAL)
+        if result is not None:
+            apply(result)
+        
     def setup_ui(self):
         main_frame = tk.Frame(self.root, bg="#E6F3FF")
         main_frame.pack(expand=True, fill=tk.BOTH, padx=20, pady=20)
@@ -375,12 +813,10 @@ class SetupScreen:
             self.bt_status_label = ttk.Label(bluetooth_frame, text="Disconnected", foreground="red")
             self.bt_status_label.grid(row=0, column=3, padx=5, pady=5)
             
-            ttk.Button(bluetooth_frame, 
+            self.refresh_ports_btn = ttk.Button(bluetooth_frame, 
                       text="Refresh Ports", 
-                      command=self.refresh_serial_ports).grid(row=1, column=0, columnspan=2, pady=5)
-            
-            # Auto-refresh ports
-            self.refresh_serial_ports()
+                      command=self.refresh_serial_ports)
+            self.refresh_ports_btn.grid(row=1, column=0, columnspan=2, pady=5)
         
         # Model selection - FIXED LAYOUT
         model_frame = ttk.LabelFrame(parent, text="AI Model Configuration")
@@ -436,9 +872,10 @@ class SetupScreen:
         self.camera_combo = ttk.Combobox(camera_frame, state="readonly", width=20)
         self.camera_combo.grid(row=0, column=1, padx=5, pady=5)
         
-        ttk.Button(camera_frame, 
+        self.refresh_cameras_btn = ttk.Button(camera_frame, 
                   text="Refresh Cameras", 
-                  command=self.refresh_cameras).grid(row=1, column=0, columnspan=2, pady=5)
+                  command=self.refresh_cameras)
+        self.refresh_cameras_btn.grid(row=1, column=0, columnspan=2, pady=5)
                   
         self.preview_btn = ttk.Button(camera_frame,
                   text="Start Preview",
@@ -475,15 +912,16 @@ class SetupScreen:
             # Initially disable perimeter controls
             self.toggle_perimeter_options()
         
-        # Auto-refresh cameras
-        self.refresh_cameras()
-        
     def setup_preview(self, parent):
         self.preview_label = tk.Label(parent, bg="#000000", 
                                      text="Preview Area\n\nFor Live Mode: Start camera preview\nFor Simulate Mode: Select video file", 
                                      fg="white", font=("Arial", 12), justify=tk.CENTER)
         self.preview_label.pack(expand=True, fill=tk.BOTH, padx=10, pady=10)
         
+        # One Tk image reused for every preview frame - frames are pasted into it
+        self._preview_photo = ImageTk.PhotoImage("RGB", (600, 400))
+        self._preview_shown = False
+        
     def toggle_perimeter_options(self):
         """Enable or disable perimeter controls based on checkbox"""
         if self.use_perimeter.get():
@@ -503,10 +941,12 @@ class SetupScreen:
         
     def refresh_serial_ports(self):
         if self.bt_available and hasattr(self, 'serial_combo'):
-            ports = self.bt.list_ports()
-            self.serial_combo['values'] = ports
-            if ports:
-                self.serial_combo.current(0)
+            self._refresh_async(self.refresh_ports_btn, self.bt.list_ports, self._apply_serial_ports)
+            
+    def _apply_serial_ports(self, ports):
+        self.serial_combo['values'] = ports
+        if ports:
+            self.serial_combo.current(0)
         
     def toggle_bluetooth(self):
         if not self.bt_available:
@@ -519,16 +959,16 @@ class SetupScreen:
                 messagebox.showwarning("Select Port", "Please select a serial port")
                 return
                 
-            def connect_thread():
-                success = self.bt.connect(port)
-                self.root.after(0, lambda: self.update_bt_status(success))
-                
-            threading.Thread(target=connect_thread, daemon=True).start()
+            self._run_async(self._connect_bt(port))
             self.bt_connect_btn.config(state=tk.DISABLED, text="Connecting...")
         else:
             self.bt.disconnect()
             self.update_bt_status(False)
             
+    async def _connect_bt(self, port):
+        success = await asyncio.get_running_loop().run_in_executor(None, self.bt.connect, port)
+        self._to_ui(self.update_bt_status, success)
+            
     def update_bt_status(self, connected):
         if connected:
             self.bt_status_label.config(text="Connected", foreground="green")
@@ -546,6 +986,15 @@ class SetupScreen:
         if path:
             self.model_path_var.set(path)
             self.check_start_conditions()
+            # Build the FP16/INT8 export now so Start Monitoring loads it from cache
+            threading.Thread(target=self._prepare_model, args=(path,), daemon=True).start()
+            
+    def _prepare_model(self, path):
+        try:
+            from detect import prepare_model
+            prepare_model(path)
+        except Exception as e:
+            print(f"Model preparation failed: {e}")
             
     def browse_video(self):
         path = filedialog.askopenfilename(
@@ -565,52 +1014,113 @@ class SetupScreen:
         # Stop any existing preview
         if hasattr(self, 'video_preview_running') and self.video_preview_running:
             self.video_preview_running = False
+            self._cancel_preview_tick()
             if hasattr(self, 'video_cap'):
                 self.video_cap.release()
             self.preview_btn.config(text="Preview Video")
             return
             
-        def preview_thread():
-            self.video_preview_running = True
-            self.video_cap = cv2.VideoCapture(self.video_path_var.get())
-            
-            if not self.video_cap.isOpened():
-                messagebox.showerror("Video Error", "Cannot open video file")
-                self.video_preview_running = False
-                return
-                
-            self.preview_btn.config(text="Stop Preview")
+        self.video_cap = open_video_file(self.video_path_var.get())
+        if not self.video_cap.isOpened():
+            messagebox.showerror("Video Error", "Cannot open video file")
+            self.video_preview_running = False
+            return
             
-            while self.video_preview_running:
-                ret, frame = self.video_cap.read()
-                if not ret:
-                    # Loop the video
-                    self.video_cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
-                    continue
-                    
-                frame = cv2.resize(frame, (600, 400))
-                rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                img = Image.fromarray(rgb)
-                imgtk = ImageTk.PhotoImage(image=img)
-                self.root.after(0, lambda: self.update_preview(imgtk))
-                time.sleep(0.03)  # ~30 FPS
-                
-            self.video_cap.release()
-            self.preview_btn.config(text="Preview Video")
+        # Playback clock so the preview keeps real time without decoding skipped frames
+        self._video_fps = self.video_cap.get(cv2.CAP_PROP_FPS) or 30.0
+        self._last_paint = time.monotonic()
+        self._frame_debt = 0.0
+            
+        self.video_preview_running = True
+        self.preview_btn.config(text="Stop Preview")
+        self._cancel_preview_tick()
+        self._bind_preview_photo()
+        self._tick_preview(self.video_cap, True)
+        
+    def _tick_preview(self, cap, is_video):
+        """Read and paint one preview frame on the Tk thread, then re-arm the timer (~30 FPS)"""
+        running = self.video_preview_running if is_video else self.preview_running
+        if not running:
+            self._preview_after_id = None
+            return
             
-        threading.Thread(target=preview_thread, daemon=True).start()
+        try:
+            # grab() only demuxes; retrieve() decodes just the frame that gets painted
+            grabbed = self._grab_due_frames(cap) if is_video else cap.grab()
+            ret, frame = cap.retrieve() if grabbed else (False, None)
+            if ret and self._native_preview and not is_video:
+                # Once a frame has been shown, a hidden window means the user closed it
+                if (self._last_frame is not None and
+                        cv2.getWindowProperty(PREVIEW_WINDOW, cv2.WND_PROP_VISIBLE) < 1):
+                    self.stop_camera_preview()
+                    return
+                self._last_frame = frame
+                # Straight BGR to the GPU-backed window - no resize, PIL or Tk blit
+                cv2.imshow(PREVIEW_WINDOW, frame)
+                cv2.waitKey(1)
+            elif ret:
+                if not is_video:
+                    self._last_frame = frame  # retrieve() hands out a fresh array, no copy needed
+                if frame.shape[:2] == (400, 600):
+                    scaled = frame  # Already preview-sized
+                else:
+                    # Nearest-neighbour is plenty for a 600x400 preview tile at half the cost
+                    scaled = cv2.resize(frame, (600, 400), dst=self._resize_buf, interpolation=cv2.INTER_NEAREST)
+                self._bgr_to_rgb(scaled, self._rgb_buf)
+                # Zero-copy view over the contiguous buffer; paste() copies it out before the next tick
+                img = Image.frombuffer("RGB", (600, 400), self._rgb_buf, "raw", "RGB", 0, 1)
+                self._preview_photo.paste(img)  # Same image object, so Tk just redraws the label
+            elif is_video:
+                # Loop the video
+                cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        except Exception as e:
+            print(f"Preview error: {e}")
             
-    def refresh_cameras(self):
-        cameras = []
-        for i in range(3):  # Check first 3 cameras
+        self._preview_after_id = self.root.after(33, self._tick_preview, cap, is_video)
+        
+    def _grab_due_frames(self, cap):
+        """Grab every video frame that fell due since the last paint, without decoding them"""
+        now = time.monotonic()
+        self._frame_debt += (now - self._last_paint) * self._video_fps
+        self._last_paint = now
+        
+        due = min(max(int(self._frame_debt), 1), 10)  # Cap the catch-up after a stall
+        self._frame_debt = max(self._frame_debt - due, 0.0)
+        for _ in range(due):
+            if not cap.grab():
+                return False
+        return True
+        
+    def _cancel_preview_tick(self):
+        """Cancel the pending preview timer, if any"""
+        if self._preview_after_id is not None:
             try:
-                cap = cv2.VideoCapture(i)
-                if cap.isOpened():
-                    cameras.append(f"Camera {i}")
-                    cap.release()
-            except:
+                self.root.after_cancel(self._preview_after_id)
+            except tk.TclError:
                 pass
-                
+            self._preview_after_id = None
+            
+    @staticmethod
+    def _probe_camera(index):
+        """Return True if camera index can be opened"""
+        try:
+            cap = cv2.VideoCapture(index, CAMERA_BACKEND)
+            opened = cap.isOpened()
+            cap.release()
+            return opened
+        except Exception:
+            return False
+        
+    def _probe_cameras(self):
+        # Probe the first 3 cameras concurrently - each probe can take seconds on Windows
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            opened = list(pool.map(self._probe_camera, range(3)))
+        return [f"Camera {i}" for i, ok in enumerate(opened) if ok]
+        
+    def refresh_cameras(self):
+        self._refresh_async(self.refresh_cameras_btn, self._probe_cameras, self._apply_cameras)
+        
+    def _apply_cameras(self, cameras):
         if self.camera_combo:
             self.camera_combo['values'] = cameras
             if cameras:
@@ -634,7 +1144,7 @@ class SetupScreen:
             
         try:
             self.camera_index = int(selected.split()[-1])
-            self.camera_cap = cv2.VideoCapture(self.camera_index)
+            self.camera_cap = open_camera(self.camera_index)
             
             if not self.camera_cap.isOpened():
                 messagebox.showerror("Camera Error", f"Cannot open camera {self.camera_index}")
@@ -647,25 +1157,41 @@ class SetupScreen:
                 if self.use_perimeter.get():
                     self.draw_perimeter_btn.config(state=tk.NORMAL)
             
-            def preview_thread():
-                while self.preview_running:
-                    ret, frame = self.camera_cap.read()
-                    if ret:
-                        frame = cv2.resize(frame, (600, 400))
-                        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                        img = Image.fromarray(rgb)
-                        imgtk = ImageTk.PhotoImage(image=img)
-                        self.root.after(0, lambda: self.update_preview(imgtk))
-                    time.sleep(0.03)
-                    
-            threading.Thread(target=preview_thread, daemon=True).start()
+            self._last_frame = None
+            self._cancel_preview_tick()
+            self._native_preview = self._open_native_preview()
+            if self._native_preview:
+                self.preview_label.config(text=f"Live preview is shown in the '{PREVIEW_WINDOW}' window")
+            else:
+                self._bind_preview_photo()
+            self._tick_preview(self.camera_cap, False)
             self.check_start_conditions()
             
         except Exception as e:
             messagebox.showerror("Camera Error", f"Error starting camera: {e}")
             
+    def _open_native_preview(self):
+        """Open the OpenGL preview window; False if disabled or OpenCV was built without OpenGL"""
+        if os.environ.get('AQUASENSE_PREVIEW', 'auto').lower() == 'tk':
+            return False
+        try:
+            cv2.namedWindow(PREVIEW_WINDOW, cv2.WINDOW_OPENGL | cv2.WINDOW_KEEPRATIO)
+            return True
+        except cv2.error:
+            return False
+            
+    def _close_native_preview(self):
+        if self._native_preview:
+            self._native_preview = False
+            try:
+                cv2.destroyWindow(PREVIEW_WINDOW)
+            except cv2.error:
+                pass
+            
     def stop_camera_preview(self):
         self.preview_running = False
+        self._cancel_preview_tick()
+        self._close_native_preview()
         if self.preview_btn:
             self.preview_btn.config(text="Start Preview" if self.mode == 'live' else "Preview Video")
         if self.perimeter_available and hasattr(self, 'draw_perimeter_btn'):
@@ -674,17 +1200,20 @@ class SetupScreen:
             self.camera_cap.release()
             self.camera_cap = None
             
-    def update_preview(self, imgtk):
-        self.preview_label.config(image=imgtk, text="")
-        self.preview_label.image = imgtk
+    def _bind_preview_photo(self):
+        """Attach the persistent preview image to the label once; frames are only pasted after that"""
+        if not self._preview_shown:
+            self.preview_label.config(image=self._preview_photo, text="")
+            self._preview_shown = True
         
     def draw_perimeter(self):
         if not self.camera_cap or not self.preview_running:
             messagebox.showwarning("Camera Error", "Start camera preview first")
             return
             
-        ret, frame = self.camera_cap.read()
-        if not ret:
+        # Snapshot of the last painted frame - the capture stays open and untouched
+        frame = self._last_frame
+        if frame is None:
             messagebox.showerror("Camera Error", "Could not read frame from camera")
             return
             
@@ -696,15 +1225,9 @@ class SetupScreen:
                 self.perimeter_status.config(text="Cancelled", foreground="red")
                 self.perimeter_configured = False
             self.check_start_conditions()
-            # Restart preview
-            self.start_camera_preview()
                 
-        # Stop preview temporarily for drawing
-        was_running = self.preview_running
-        self.preview_running = False
-        time.sleep(0.5)
-        
-        # Draw perimeter
+        # Draw perimeter - the OpenCV window blocks the Tk loop, so the preview tick
+        # simply resumes once drawing finishes
         if self.perimeter:
             success = self.perimeter.draw_perimeter_interactive(frame)
             perimeter_callback(success)
@@ -748,6 +1271,11 @@ class SetupScreen:
             config['video_path'] = self.video_path_var.get()
         else:
             config['camera_index'] = self.camera_index
+            # Hand the open preview capture to the monitor so the camera isn't reinitialized
+            if self.camera_cap is not None and self.camera_cap.isOpened():
+                self._cancel_preview_tick()
+                config['camera_cap'] = self.camera_cap
+                self.camera_cap = None  # Keep cleanup_preview from releasing it
             # Only include perimeter if it's available and enabled
             if self.perimeter_available and self.use_perimeter.get() and self.perimeter_configured:
                 config['perimeter'] = self.perimeter
@@ -773,6 +1301,8 @@ class SetupScreen:
     def cleanup_preview(self):
         """Safely cleanup preview resources"""
         self.preview_running = False
+        self._cancel_preview_tick()
+        self._close_native_preview()
         if hasattr(self, 'video_preview_running'):
             self.video_preview_running = False
         if hasattr(self, 'video_cap'):
@@ -780,6 +1310,7 @@ class SetupScreen:
         if self.camera_cap:
             self.camera_cap.release()
             self.camera_cap = None
+        self._aio_loop.call_soon_threadsafe(self._aio_loop.stop)
         
     def back_to_main(self):
         self.cleanup_preview()
@@ -797,26 +1328,63 @@ class SetupScreen:
         self.root.mainloop()
 
 class MonitorScreen:
+    # Fixed label texts, interned so the per-frame "unchanged?" check is an identity hit
+    _STATUS_NORMAL = sys.intern("● MONITORING: NORMAL")
+    _STATUS_DROWNING = sys.intern("● ALERT: DROWNING DETECTED")
+    _DROWN_NO = sys.intern("Drowning: No Alert")
+    _DROWN_ALERT = sys.intern("Drowning: CONTINUOUS ALERT")
+    _DROWN_OVERRIDDEN = sys.intern("Drowning: OVERRIDDEN")
+    _OBS_SENT = sys.intern("Obstruction: SIGNAL SENT")
+    _OBS_CLEARED = sys.intern("Obstruction: CLEARED")
+    
+    # Alert edge -> (Bluetooth command, label, label options)
+    _ALERT_ACTIONS = {
+        'drowning_overridden': ('send_clear_alert', 'drowning_alert_label',
+                                {'text': _DROWN_OVERRIDDEN, 'foreground': "orange"}),
+        'obstruction_started': ('send_obstruction_alert', 'obstruction_alert_label',
+                                {'text': _OBS_SENT, 'foreground': "red"}),
+        'obstruction_cleared': ('send_clear_alert', 'obstruction_alert_label',
+                                {'text': _OBS_CLEARED, 'foreground': "green"}),
+        'drowning_started': ('send_drowning_alert', 'drowning_alert_label',
+                             {'text': _DROWN_ALERT, 'foreground': "red"}),
+        'drowning_cleared': ('send_clear_alert', 'drowning_alert_label',
+                             {'text': _DROWN_NO, 'foreground': "green"}),
+    }
+    
     def __init__(self, config):
+        load_heavy_modules()  # No-op when the splash already loaded them
         self.config = config
+        # Hot-path config lookups resolved once instead of per frame
+        self._is_live = config['mode'] == 'live'
+        self._bt = config.get('bluetooth') if config.get('bluetooth_connected') else None
+        self._peri = config.get('perimeter') if self._is_live and config.get('use_perimeter', False) else None
         self.root = tk.Tk()
         self.root.title("AquaSense-AI - Monitoring")
         self.root.geometry("1200x800")
         self.root.configure(bg="#E6F3FF")
         
-        self.running = False
+        # Set while stopped; every worker waits on it, so stopping wakes them all at once
+        self._stop_event = threading.Event()
+        self._stop_event.set()
         self.detector = None
         self.cap = None
-        self.last_perimeter_check = 0
-        self.perimeter_interval = 2.0  # Check every 2 seconds for faster response
-        self.last_drowning_state = False
-        self.last_obstruction_state = False
-        
-        # Obstruction tracking - MODIFIED
-        self.obstruction_alert_active = False
-        self.obstruction_start_time = 0  # Track when obstruction first detected
+        self.last_perimeter_check = 0  # monotonic_ns
+        self.perimeter_interval = 0.5  # Check twice a second - the check is all-OpenCV and off the detect thread
+        self._peri_interval_ns = int(self.perimeter_interval * 1e9)
+        # Perimeter checks run off the detect thread, one at a time
+        self._peri_executor = ThreadPoolExecutor(max_workers=1)
+        self._peri_future = None
+        
+        # FPS as an exponential moving average of frame intervals
+        self._ema_dt = None
+        self._ema_alpha = 0.1
+        
+        # Obstruction/drowning alert state - only its transitions reach Bluetooth and the labels
         self.obstruction_min_duration = 6.0  # Minimum 6 seconds before clearing
-        self.obstruction_signal_sent = False  # Track if signal already sent
+        self._obstr_min_ns = int(self.obstruction_min_duration * 1e9)
+        self._alert_fsm = AlertStateMachine(self._obstr_min_ns)
+        # Bluetooth commands are written by their own thread so a slow UART never stalls detection
+        self._bt_q = queue.Queue()
         
         # Detection fallback
         self.detection_error_count = 0
@@ -826,6 +1394,34 @@ class MonitorScreen:
         # Visibility controls - REMOVED detection boxes visibility
         self.show_perimeter = True
         
+        # Capture -> detect -> display pipeline; single-slot queues keep only the freshest item
+        self._raw_q = queue.Queue(maxsize=1)
+        self._annot_q = queue.Queue(maxsize=1)
+        self._workers = []
+        self._bt_thread = None
+        # Label updates from the detect worker, applied on the Tk thread by _display_tick
+        self._ui_updates = {}
+        self._ui_lock = threading.Lock()
+        self._ui_sent = {}  # Last options queued per label - repeats are dropped before reaching Tk
+        self._label_cfg = {}  # Cached bound config() per label
+        self._label_vars = {}  # Label name -> StringVar bound as its textvariable
+        self._label_style = {}  # Non-text options last applied per label
+        
+        # Display runs off one recurring Tk timer at target_fps, whatever the capture/inference rate
+        self.target_fps = 30
+        self._tick_ms = max(1, int(1000 / self.target_fps))
+        self._display_after_id = None
+        
+        # Preallocated display conversion buffers (640x480 processing size -> 800x600 display)
+        # The display buffer is the pixel section of a binary PPM blob, so resizing into it
+        # produces image data Tk can load directly without going through PIL
+        self._rgb_buf = np.empty((480, 640, 3), dtype=np.uint8)
+        ppm_header = b'P6\n800 600\n255\n'
+        self._ppm = bytearray(len(ppm_header) + 600 * 800 * 3)
+        self._ppm[:len(ppm_header)] = ppm_header
+        self._disp_buf = np.frombuffer(self._ppm, dtype=np.uint8,
+                                       offset=len(ppm_header)).reshape(600, 800, 3)
+        
         self.setup_ui()
         
     def setup_ui(self):
@@ -845,7 +1441,7 @@ class MonitorScreen:
         title_label.pack(side=tk.LEFT)
         
         self.status_label = tk.Label(header_frame,
-                                    text="● READY",
+                                    textvariable=self._label_var('status_label', "● READY"),
                                     font=("Arial", 12, "bold"),
                                     fg="green",
                                     bg="#E6F3FF")
@@ -864,6 +1460,10 @@ class MonitorScreen:
                                    fg="white", font=("Arial", 14))
         self.video_label.pack(expand=True, fill=tk.BOTH, padx=10, pady=10)
         
+        # One Tk image reused for every displayed frame - frames are loaded into it as PPM data
+        self._photo = tk.PhotoImage(width=800, height=600)
+        self._photo_shown = False
+        
         # Right panel - Info and controls
         right_panel = tk.Frame(content_frame, bg="#E6F3FF", width=300)
         right_panel.pack(side=tk.RIGHT, fill=tk.Y)
@@ -873,13 +1473,13 @@ class MonitorScreen:
         stats_frame = ttk.LabelFrame(right_panel, text="Live Statistics", width=280)
         stats_frame.pack(fill=tk.X, pady=(0, 15))
         
-        self.fps_label = ttk.Label(stats_frame, text="FPS: --")
+        self.fps_label = ttk.Label(stats_frame, textvariable=self._label_var('fps_label', "FPS: --"))
         self.fps_label.pack(anchor=tk.W, pady=2)
         
-        self.detection_label = ttk.Label(stats_frame, text="Detections: 0")
+        self.detection_label = ttk.Label(stats_frame, textvariable=self._label_var('detection_label', "Detections: 0"))
         self.detection_label.pack(anchor=tk.W, pady=2)
         
-        self.obstruction_label = ttk.Label(stats_frame, text="Obstructions: 0")
+        self.obstruction_label = ttk.Label(stats_frame, textvariable=self._label_var('obstruction_label', "Obstructions: 0"))
         self.obstruction_label.pack(anchor=tk.W, pady=2)
         
         # Detector status
@@ -890,10 +1490,10 @@ class MonitorScreen:
         self.alert_frame = ttk.LabelFrame(right_panel, text="Alert Status", width=280)
         self.alert_frame.pack(fill=tk.X, pady=(0, 15))
         
-        self.drowning_alert_label = ttk.Label(self.alert_frame, text="Drowning: No Alert", foreground="green")
+        self.drowning_alert_label = ttk.Label(self.alert_frame, textvariable=self._label_var('drowning_alert_label', "Drowning: No Alert"), foreground="green")
         self.drowning_alert_label.pack(anchor=tk.W, pady=2)
         
-        self.obstruction_alert_label = ttk.Label(self.alert_frame, text="Obstruction: No Alert", foreground="green")
+        self.obstruction_alert_label = ttk.Label(self.alert_frame, textvariable=self._label_var('obstruction_alert_label', "Obstruction: No Alert"), foreground="green")
         self.obstruction_alert_label.pack(anchor=tk.W, pady=2)
         
         # Visibility Controls - REMOVED detection boxes checkbox
@@ -966,22 +1566,22 @@ class MonitorScreen:
         
     def test_drowning_alert(self):
         """Test drowning alert via Bluetooth"""
-        if self.config.get('bluetooth_connected') and self.config.get('bluetooth'):
-            self.config['bluetooth'].send_drowning_alert()
-            self.drowning_alert_label.config(text="Drowning: TEST ALERT", foreground="red")
+        if self._bt is not None:
+            self._bt.send_drowning_alert()
+            self._apply_label('drowning_alert_label', text="Drowning: TEST ALERT", foreground="red")
             
     def test_obstruction_alert(self):
         """Test obstruction alert via Bluetooth"""
-        if self.config.get('bluetooth_connected') and self.config.get('bluetooth'):
-            self.config['bluetooth'].send_obstruction_alert()
-            self.obstruction_alert_label.config(text="Obstruction: TEST ALERT", foreground="orange")
+        if self._bt is not None:
+            self._bt.send_obstruction_alert()
+            self._apply_label('obstruction_alert_label', text="Obstruction: TEST ALERT", foreground="orange")
             
     def test_clear_alerts(self):
         """Clear all alerts via Bluetooth"""
-        if self.config.get('bluetooth_connected') and self.config.get('bluetooth'):
-            self.config['bluetooth'].send_clear_alert()
-            self.drowning_alert_label.config(text="Drowning: No Alert", foreground="green")
-            self.obstruction_alert_label.config(text="Obstruction: No Alert", foreground="green")
+        if self._bt is not None:
+            self._bt.send_clear_alert()
+            self._apply_label('drowning_alert_label', text="Drowning: No Alert", foreground="green")
+            self._apply_label('obstruction_alert_label', text="Obstruction: No Alert", foreground="green")
     
     def initialize_detector_with_fallback(self):
         """Initialize detector with comprehensive error handling and fallback"""
@@ -990,13 +1590,14 @@ class MonitorScreen:
                 print("Attempting to initialize RealtimeDetector...")
                 detector = RealtimeDetector(
                     self.config['model_path'],
-                    conf=self.config['confidence']
+                    conf=self.config['confidence'],
+                    produce_annotated=True
                 )
                 # Test the detector with a dummy frame
                 test_frame = np.zeros((480, 640, 3), dtype=np.uint8)
                 annotated, detected, detections = detector.detect_frame(test_frame)
                 print("RealtimeDetector initialized successfully")
-                self.detector_status_label.config(text="Detector: YOLO (Active)", foreground="green")
+                self._set_label('detector_status_label', text="Detector: YOLO (Active)", foreground="green")
                 self.using_fallback_detector = False
                 return detector
 
@@ -1018,7 +1619,7 @@ class MonitorScreen:
                               cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
                     return annotated, False, []
             
-            self.detector_status_label.config(text="Detector: Basic (Error)", foreground="red")
+            self._set_label('detector_status_label', text="Detector: Basic (Error)", foreground="red")
             self.using_fallback_detector = True
             return BasicDetector(self.config['model_path'], self.config['confidence'])
     
@@ -1038,33 +1639,44 @@ class MonitorScreen:
                     print("Using demo video")
             else:
                 camera_index = self.config.get('camera_index', 0)
-                self.cap = cv2.VideoCapture(camera_index)
-                print(f"Using camera: {camera_index}")
+                camera_cap = self.config.pop('camera_cap', None)
+                if camera_cap is not None:
+                    print(f"Using camera: {camera_index} (kept open from preview)")
+                else:
+                    camera_cap = open_camera(camera_index)
+                    print(f"Using camera: {camera_index}")
+                if camera_cap.isOpened():
+                    self.cap = CameraFeed(camera_cap)
+                else:
+                    camera_cap.release()
                 
             if not self.cap or not self.cap.isOpened():
                 self.cap = self.create_demo_video()
                 print("Fallback to demo video")
                 
-            self.running = True
-            self.status_label.config(text="● RUNNING", fg="green")
-            self.frame_count = 0
-            self.start_time = time.time()
-            self.last_fps_update = time.time()
+            self._stop_event.clear()
+            self._apply_label('status_label', text="● RUNNING", fg="green")
+            self.start_time = time.monotonic_ns()
+            self._prev_frame_ns = self.start_time
+            self._last_fps_label_ns = self.start_time
+            self._ema_dt = None
             self.detection_count = 0
             self.obstruction_count = 0
-            self.last_drowning_state = False
-            self.last_obstruction_state = False
-            
-            # Initialize obstruction tracking - MODIFIED
-            self.obstruction_alert_active = False
-            self.obstruction_start_time = 0
-            self.obstruction_signal_sent = False
+            self._alert_fsm.reset()
             
             # Reset error counter
             self.detection_error_count = 0
             
-            # Start monitoring loop
-            self.monitor_loop()
+            # Start the capture and detect workers, then the Tk display tick
+            self._workers = [threading.Thread(target=self._capture_worker, daemon=True),
+                             threading.Thread(target=self._detect_worker, daemon=True)]
+            self._bt_thread = None
+            if self._bt is not None:
+                self._bt_thread = threading.Thread(target=self._bt_worker, daemon=True)
+                self._workers.append(self._bt_thread)
+            for worker in self._workers:
+                worker.start()
+            self._display_tick()
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to start monitoring: {e}")
@@ -1072,289 +1684,335 @@ class MonitorScreen:
     
     def create_demo_video(self):
         """Create a demo video capture for testing"""
-        cap = type('DemoCapture', (), {})()
-        cap.frame_count = 0
-        
-        def read():
-            frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        return _DemoCapture()
+            
+    def _label_var(self, name, text):
+        """Create the StringVar a label displays, so text updates are a variable set rather than a configure"""
+        var = self._label_vars[name] = tk.StringVar(master=self.root, value=text)
+        return var
+        
+    def _apply_label(self, name, **options):
+        """Apply label options on the Tk thread: text through the label's StringVar, styling only when it changed"""
+        var = self._label_vars.get(name)
+        if var is not None and 'text' in options:
+            var.set(options.pop('text'))
+            if not options or self._label_style.get(name) == options:
+                return
+            self._label_style[name] = options
+        configure = self._label_cfg.get(name)
+        if configure is None:
+            configure = self._label_cfg[name] = getattr(self, name).config
+        configure(**options)
+        
+    def _set_label(self, name, **options):
+        """Queue a label config() from a worker thread; the display tick applies it on the Tk thread"""
+        if self._ui_sent.get(name) == options:
+            return  # Label already shows (or is about to show) exactly this
+        self._ui_sent[name] = options
+        with self._ui_lock:
+            self._ui_updates[name] = options
+            
+    def _put_latest(self, q, item):
+        """Replace whatever is waiting in a single-slot queue so the consumer always gets the freshest item"""
+        try:
+            q.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            q.put_nowait(item)
+        except queue.Full:
+            pass
             
-            # Add demo graphics
-            cv2.putText(frame, "DEMO MODE", (50, 50), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
-            cv2.putText(frame, "AquaSense-AI Monitoring", (50, 100), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 1)
+    def _capture_worker(self):
+        """Capture stage: read and resize frames, hand them to the detect stage"""
+        is_simulate = not self._is_live
+        stop = self._stop_event
+        while not stop.is_set():
+            try:
+                ret, frame = self.cap.read()
+                if not ret or frame is None:
+                    if is_simulate and hasattr(self.cap, 'set'):
+                        # Loop the video
+                        self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                    stop.wait(0.03)
+                    continue
+                    
+                # Resize frame for consistent processing (tuned cameras already deliver 640x480)
+                if frame.shape[:2] != (480, 640):
+                    frame = cv2.resize(frame, (640, 480))
+                
+                if is_simulate:
+                    # Video files play every frame - block until the detector takes it
+                    while not stop.is_set():
+                        try:
+                            self._raw_q.put(frame, timeout=0.1)
+                            break
+                        except queue.Full:
+                            pass
+                else:
+                    # Live cameras: drop stale frames, keep only the newest
+                    self._put_latest(self._raw_q, frame)
+            except Exception as e:
+                print(f"Capture error: {e}")
+                stop.wait(0.03)
+                
+    def _detect_worker(self):
+        """Detect stage: inference, perimeter checks, alert state and overlays"""
+        stop = self._stop_event
+        while not stop.is_set():
+            try:
+                frame = self._raw_q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            try:
+                annotated = self._process_frame(frame)
+                self._put_latest(self._annot_q, annotated)
+            except Exception as e:
+                print(f"Monitoring loop error: {e}")
+                
+    def _bt_worker(self):
+        """
+        Bluetooth stage: send queued alert commands until the None that stop_monitoring queues
+        after the last one - blocks on the queue between alerts instead of polling
+        """
+        bt = self._bt
+        stop = False
+        while not stop:
+            command = self._bt_q.get()
+            stop = command is None
+            # Each command sets the Arduino's whole alert state, so a backlog behind a slow
+            # UART collapses to its newest command rather than replaying stale ones
+            while not stop:
+                try:
+                    newer = self._bt_q.get_nowait()
+                except queue.Empty:
+                    break
+                if newer is None:
+                    stop = True
+                else:
+                    command = newer
+            if command is None:
+                continue
+            try:
+                getattr(bt, command)()
+            except Exception as e:
+                print(f"Bluetooth send error: {e}")
+                
+    def _display_tick(self):
+        """Display stage on the Tk thread: apply queued label updates and show the newest frame"""
+        if self._stop_event.is_set():
+            return
             
-            # Moving elements
-            x = (cap.frame_count * 5) % 500
-            cv2.rectangle(frame, (x, 150), (x + 100, 250), (0, 255, 0), 2)
+        with self._ui_lock:
+            updates, self._ui_updates = self._ui_updates, {}
+        for name, options in updates.items():
+            self._apply_label(name, **options)
             
-            cap.frame_count += 1
-            return True, frame
-        
-        cap.read = read
-        cap.isOpened = lambda: True
-        cap.release = lambda: None
-        cap.set = lambda prop, value: True
+        # At most one frame per tick; if the pipeline is slower than the tick, show nothing new
+        try:
+            annotated = self._annot_q.get_nowait()
+        except queue.Empty:
+            annotated = None
+        if annotated is not None:
+            self._show_frame(annotated)
+            
+        self._display_after_id = self.root.after(self._tick_ms, self._display_tick)
+            
+    def _process_frame(self, frame):
+        """Run one frame through detection and alert handling; returns the annotated frame"""
+        bt = self._bt
+        peri = self._peri
+        now = time.monotonic_ns()  # One clock read per frame; all timing below is integer ns
+        # Run detection with comprehensive error handling
+        detected = False
+        annotated = frame.copy()
         
-        return cap
-            
-    def monitor_loop(self):
-        if not self.running:
-            return
-            
         try:
-            ret, frame = self.cap.read()
-            if not ret:
-                if self.config['mode'] == 'simulate':
-                    if hasattr(self.cap, 'set'):
-                        self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
-                    self.root.after(30, self.monitor_loop)
-                    return
-                else:
-                    self.root.after(30, self.monitor_loop)
-                    return
+            # Ensure frame is in correct format for detection
+            if frame.dtype != np.uint8:
+                frame = frame.astype(np.uint8)
+                
+            annotated, detected, detections = self.detector.detect_frame(frame)
+            # The detector keeps reusing its buffers (and returns the same one on skipped
+            # frames), so overlays are drawn on a copy the display pipeline owns
+            if annotated is not None:
+                annotated = annotated.copy()
             
-            # Ensure frame is valid
-            if frame is None:
-                print("Warning: Received None frame")
-                self.root.after(30, self.monitor_loop)
-                return
+            # Reset error count on successful detection
+            self.detection_error_count = 0
+            
+            # Ensure annotated frame is not None
+            if annotated is None:
+                print("Warning: Detector returned None annotated frame")
+                annotated = frame.copy()
+                cv2.putText(annotated, "No Detection Output", (50, 50),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
                 
-            # Resize frame for consistent processing
-            frame = cv2.resize(frame, (640, 480))
+        except Exception as e:
+            self.detection_error_count += 1
+            print(f"Detection error {self.detection_error_count}: {e}")
             
-            # Run detection with comprehensive error handling
-            detected = False
+            # Create a fallback annotated frame
             annotated = frame.copy()
+            cv2.putText(annotated, f"Detection Error", (50, 50),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
+            cv2.putText(annotated, f"Using fallback mode", (50, 80),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 1)
+            detected = False
             
+            # If too many errors, switch to basic mode
+            if self.detection_error_count >= self.max_detection_errors and not self.using_fallback_detector:
+                print("Too many detection errors, switching to fallback mode")
+                self.detector = self.initialize_detector_with_fallback()
+        
+        # Update detection count
+        if detected:
+            self.detection_count += 1
+            self._set_label('detection_label', text=f"Detections: {self.detection_count}")
+        
+        # Perimeter monitoring for live mode - ONLY IF ENABLED
+        current_obstruction = False
+        obstruction_percentage = 0
+        
+        # The check runs on its own worker; its result is picked up on whichever frame it lands
+        future = self._peri_future
+        if future is not None and future.done():
+            self._peri_future = None
             try:
-                # Ensure frame is in correct format for detection
-                if frame.dtype != np.uint8:
-                    frame = frame.astype(np.uint8)
-                    
-                annotated, detected, detections = self.detector.detect_frame(frame)
+                obstructed, percentage = future.result()
                 
-                # Reset error count on successful detection
-                self.detection_error_count = 0
+                # Use reasonable obstruction threshold
+                current_obstruction = obstructed and percentage >= 40.0
+                obstruction_percentage = percentage
                 
-                # Ensure annotated frame is not None
-                if annotated is None:
-                    print("Warning: Detector returned None annotated frame")
-                    annotated = frame.copy()
-                    cv2.putText(annotated, "No Detection Output", (50, 50),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+                if current_obstruction:
+                    self.obstruction_count += 1
+                    self._set_label('obstruction_label', text=f"Obstructions: {self.obstruction_count}")
                     
+                    # Add obstruction overlay
+                    draw_text(annotated, f"PERIMETER OBSTRUCTED: {percentage:.1f}%", 
+                              (10, annotated.shape[0] - 30), 0.7, (0, 0, 255), 2)
             except Exception as e:
-                self.detection_error_count += 1
-                print(f"Detection error {self.detection_error_count}: {e}")
-                
-                # Create a fallback annotated frame
-                annotated = frame.copy()
-                cv2.putText(annotated, f"Detection Error", (50, 50),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
-                cv2.putText(annotated, f"Using fallback mode", (50, 80),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 1)
-                detected = False
+                print(f"Perimeter check error: {e}")
                 
-                # If too many errors, switch to basic mode
-                if self.detection_error_count >= self.max_detection_errors and not self.using_fallback_detector:
-                    print("Too many detection errors, switching to fallback mode")
-                    self.detector = self.initialize_detector_with_fallback()
-            
-            # Update detection count
-            if detected:
-                self.detection_count += 1
-                self.detection_label.config(text=f"Detections: {self.detection_count}")
-            
-            # Perimeter monitoring for live mode - ONLY IF ENABLED
-            current_obstruction = False
-            obstruction_percentage = 0
-            
-            if (self.config['mode'] == 'live' and 
-                self.config.get('use_perimeter', False) and
-                self.config.get('perimeter') and
-                time.time() - self.last_perimeter_check > self.perimeter_interval):
-                
-                try:
-                    obstructed, percentage = self.config['perimeter'].check_obstruction(frame)
-                    
-                    # Use reasonable obstruction threshold
-                    current_obstruction = obstructed and percentage >= 40.0
-                    obstruction_percentage = percentage
-                    
-                    if current_obstruction:
-                        self.obstruction_count += 1
-                        self.obstruction_label.config(text=f"Obstructions: {self.obstruction_count}")
-                        
-                        # Add obstruction overlay
-                        cv2.putText(annotated, f"PERIMETER OBSTRUCTED: {percentage:.1f}%", 
-                                (10, annotated.shape[0] - 30),
-                                cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
-                    
-                    self.last_perimeter_check = time.time()
-                except Exception as e:
-                    print(f"Perimeter check error: {e}")
+        if (peri is not None and self._peri_future is None and
+                now - self.last_perimeter_check > self._peri_interval_ns):
+            self._peri_future = self._peri_executor.submit(peri.check_obstruction, frame)
+            self.last_perimeter_check = now
+        
+        # Alerts only reach Bluetooth (and their labels) on state transitions
+        fsm = self._alert_fsm
+        if bt is not None:
+            for event in fsm.step(detected, current_obstruction, now):
+                command, label, options = self._ALERT_ACTIONS[event]
+                self._bt_q.put(command)
+                self._set_label(label, **options)
+            
+            if fsm.state is fsm.OBSTRUCTED:
+                obstruction_ns = now - fsm.obstruction_start_ns
+                self._set_label('obstruction_alert_label', text=f"Obstruction: {obstruction_ns / 1e9:.1f}s", 
+                                foreground="red" if obstruction_ns >= 1_000_000_000 else "orange")
+            elif fsm.state is fsm.OBSTR_HOLDING:
+                obstruction_ns = now - fsm.obstruction_start_ns
+                self._set_label('obstruction_alert_label', 
+                    text=f"Obstruction: {obstruction_ns / 1e9:.1f}s (HOLD)", 
+                    foreground="orange"
+                )
+            
+        # Draw perimeter if configured and visible and enabled
+        if peri is not None and peri.drawing_complete and self.show_perimeter:
             
-            # PRIORITY: Handle obstruction alerts with 6-second minimum duration
-            if self.config.get('bluetooth_connected') and self.config.get('bluetooth'):
-                if current_obstruction:
-                    current_time = time.time()
-                    
-                    if not self.obstruction_alert_active:
-                        # First detection - initialize tracking
-                        self.obstruction_start_time = current_time
-                        self.obstruction_alert_active = True
-                        self.obstruction_signal_sent = False
-                        print("🚨 Initial obstruction detection")
-                    
-                    obstruction_duration = current_time - self.obstruction_start_time
-                    
-                    # Send signal immediately on first detection
-                    if not self.obstruction_signal_sent:
-                        self.config['bluetooth'].send_obstruction_alert()
-                        self.obstruction_signal_sent = True
-                        self.obstruction_alert_label.config(text="Obstruction: SIGNAL SENT", foreground="red")
-                        print("📡 Obstruction signal sent to Arduino")
-                    
-                    # Update display with duration
-                    duration_text = f"Obstruction: {obstruction_duration:.1f}s"
-                    self.obstruction_alert_label.config(text=duration_text, 
-                                                      foreground="red" if obstruction_duration >= 1.0 else "orange")
-                    
-                    # Override drowning alerts
-                    if self.last_drowning_state:
-                        self.config['bluetooth'].send_clear_alert()
-                        self.drowning_alert_label.config(text="Drowning: OVERRIDDEN", foreground="orange")
-                        self.last_drowning_state = False
-                        
-                elif self.obstruction_alert_active:
-                    # Obstruction cleared - check if we should maintain state
-                    current_time = time.time()
-                    obstruction_duration = current_time - self.obstruction_start_time
-                    
-                    if obstruction_duration >= self.obstruction_min_duration:
-                        # Valid obstruction that lasted long enough - clear it
-                        self.config['bluetooth'].send_clear_alert()
-                        self.obstruction_alert_label.config(text="Obstruction: CLEARED", foreground="green")
-                        self.obstruction_alert_active = False
-                        self.obstruction_signal_sent = False
-                        print(f"✅ Obstruction cleared after {obstruction_duration:.1f} seconds")
-                    else:
-                        # Brief obstruction - keep displaying but don't send another signal
-                        self.obstruction_alert_label.config(
-                            text=f"Obstruction: {obstruction_duration:.1f}s (HOLD)", 
-                            foreground="orange"
-                        )
-                        # Don't clear the alert_active flag - maintain obstructed state
-            
-            # SECONDARY: Handle drowning detection (only if no obstruction)
-            if (self.config.get('bluetooth_connected') and self.config.get('bluetooth') and
-                not self.obstruction_alert_active):  # Use obstruction_alert_active instead of current_obstruction
-                
-                if detected and not self.last_drowning_state:
-                    # Start drowning alert (continuous - no pulsing)
-                    self.config['bluetooth'].send_drowning_alert()
-                    self.drowning_alert_label.config(text="Drowning: CONTINUOUS ALERT", foreground="red")
-                    self.last_drowning_state = True
-                    print("Drowning alert sent - continuous tone")
-                elif not detected and self.last_drowning_state:
-                    # Clear drowning alert
-                    self.config['bluetooth'].send_clear_alert()
-                    self.drowning_alert_label.config(text="Drowning: No Alert", foreground="green")
-                    self.last_drowning_state = False
-                    print("Drowning alert cleared")
-                
-            # Draw perimeter if configured and visible and enabled
-            if (self.config['mode'] == 'live' and 
-                self.config.get('use_perimeter', False) and
-                self.config.get('perimeter') and
-                self.config['perimeter'].drawing_complete and
-                self.show_perimeter):
-                
-                try:
-                    annotated = self.config['perimeter'].draw_perimeter_on_frame(annotated)
-                except Exception as e:
-                    print(f"Perimeter drawing error: {e}")
-            
-            # Update status with OBSTRUCTION PRIORITY
-            if self.obstruction_alert_active:
-                current_time = time.time()
-                obstruction_duration = current_time - self.obstruction_start_time
-                
-                if obstruction_duration >= self.obstruction_min_duration:
-                    status_text = f"● PERIMETER OBSTRUCTED: {obstruction_duration:.1f}s"
-                else:
-                    status_text = f"● OBSTRUCTION DETECTED: {obstruction_duration:.1f}s"
-                
-                self.status_label.config(text=status_text, fg="red")
-                
-                # Add visual feedback to video frame
-                cv2.putText(annotated, status_text, (50, 80),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 2)
-            elif detected:
-                # Drowning detection (secondary priority)
-                self.status_label.config(text="● ALERT: DROWNING DETECTED", fg="red")
-                cv2.putText(annotated, "ALERT: DROWNING DETECTED", (50, 80),
-                        cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 3)
-            else:
-                self.status_label.config(text="● MONITORING: NORMAL", fg="green")
-            
-            # Update FPS
-            self.frame_count += 1
-            current_time = time.time()
-            if current_time - self.last_fps_update >= 1.0:
-                self.fps = self.frame_count / (current_time - self.last_fps_update)
-                self.fps_label.config(text=f"FPS: {self.fps:.1f}")
-                self.frame_count = 0
-                self.last_fps_update = current_time
-            
-            # Convert for display with error handling
             try:
-                # Ensure annotated is a valid frame
-                if annotated is None:
-                    annotated = frame.copy()
-                
-                # Ensure frame is proper type for conversion
-                if annotated.dtype != np.uint8:
-                    annotated = annotated.astype(np.uint8)
-                    
-                frame_rgb = cv2.cvtColor(annotated, cv2.COLOR_BGR2RGB)
-                frame_resized = cv2.resize(frame_rgb, (800, 600))
-                img = Image.fromarray(frame_resized)
-                imgtk = ImageTk.PhotoImage(image=img)
-                
-                self.video_label.config(image=imgtk, text="")
-                self.video_label.image = imgtk
-                
+                annotated = peri.draw_perimeter_on_frame(annotated)
             except Exception as e:
-                print(f"Display conversion error: {e}")
-                # Create error display
-                error_frame = np.zeros((600, 800, 3), dtype=np.uint8)
-                cv2.putText(error_frame, f"Display Error", (50, 50),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-                cv2.putText(error_frame, f"{str(e)[:100]}...", (50, 80),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
-                img = Image.fromarray(error_frame)
-                imgtk = ImageTk.PhotoImage(image=img)
-                self.video_label.config(image=imgtk, text="")
-                self.video_label.image = imgtk
+                print(f"Perimeter drawing error: {e}")
+        
+        # Update status with OBSTRUCTION PRIORITY
+        if fsm.obstruction_active:
+            obstruction_ns = now - fsm.obstruction_start_ns
             
-            # Continue loop with proper error handling
-            if self.running:
-                self.root.after_idle(self.monitor_loop)
+            if obstruction_ns >= self._obstr_min_ns:
+                status_text = f"● PERIMETER OBSTRUCTED: {obstruction_ns / 1e9:.1f}s"
+            else:
+                status_text = f"● OBSTRUCTION DETECTED: {obstruction_ns / 1e9:.1f}s"
             
-        except Exception as e:
-            print(f"Monitoring loop error: {e}")
-            if self.running:
-                self.root.after(30, self.monitor_loop)
+            self._set_label('status_label', text=status_text, fg="red")
             
+            # Add visual feedback to video frame
+            draw_text(annotated, status_text, (50, 80), 0.8, (0, 0, 255), 2)
+        elif detected:
+            # Drowning detection (secondary priority)
+            self._set_label('status_label', text=self._STATUS_DROWNING, fg="red")
+            draw_text(annotated, "ALERT: DROWNING DETECTED", (50, 80), 1, (0, 0, 255), 3)
+        else:
+            self._set_label('status_label', text=self._STATUS_NORMAL, fg="green")
+        
+        # Update FPS - exponential moving average of the frame interval, label refreshed twice a second
+        dt = (now - self._prev_frame_ns) / 1e9
+        self._prev_frame_ns = now
+        a = self._ema_alpha
+        self._ema_dt = dt if self._ema_dt is None else (1 - a) * self._ema_dt + a * dt
+        if now - self._last_fps_label_ns > 500_000_000 and self._ema_dt > 0:
+            self.fps = 1.0 / self._ema_dt
+            self._set_label('fps_label', text=f"FPS: {self.fps:.1f}")
+            self._last_fps_label_ns = now
+        
+        return annotated
+        
+    def _show_frame(self, annotated):
+        """Convert an annotated BGR frame and put it in the video label"""
+        # Convert for display with error handling
+        try:
+            # Ensure frame is proper type for conversion
+            if annotated.dtype != np.uint8:
+                annotated = annotated.astype(np.uint8)
+                
+            # OpenCV writes into the dst buffers in place (it only reallocates on a size mismatch)
+            frame_rgb = cv2.cvtColor(annotated, cv2.COLOR_BGR2RGB, dst=self._rgb_buf)
+            cv2.resize(frame_rgb, (800, 600), dst=self._disp_buf,
+                       interpolation=cv2.INTER_LINEAR)
+            self._paste_photo()
+            
+        except Exception as e:
+            print(f"Display conversion error: {e}")
+            # Create error display
+            error_frame = self._disp_buf
+            error_frame.fill(0)
+            cv2.putText(error_frame, f"Display Error", (50, 50),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+            cv2.putText(error_frame, f"{str(e)[:100]}...", (50, 80),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+            self._paste_photo()
+            
+    def _paste_photo(self):
+        """Load the PPM display buffer into the persistent video image, binding it to the label once"""
+        # _tkinter only passes bytes (not bytearray) to Tcl as binary data
+        self._photo.configure(data=bytes(self._ppm), format='PPM')
+        if not self._photo_shown:
+            self.video_label.config(image=self._photo, text="")
+            self._photo_shown = True
+
     def stop_monitoring(self):
-        self.running = False
+        self._stop_event.set()
+        if self._display_after_id is not None:
+            try:
+                self.root.after_cancel(self._display_after_id)
+            except tk.TclError:
+                pass
+            self._display_after_id = None
+        for worker in self._workers:
+            if worker is self._bt_thread:
+                # The stages that queue commands have finished, so this lands after the last one
+                self._bt_q.put(None)
+            worker.join(timeout=2.0)
+        self._workers = []
+        self._bt_thread = None
+        self._peri_executor.shutdown(wait=False, cancel_futures=True)
         
         # Clear all Bluetooth alerts
-        if self.config.get('bluetooth_connected') and self.config.get('bluetooth'):
+        if self._bt is not None:
             try:
-                self.config['bluetooth'].send_clear_alert()
+                self._bt.send_clear_alert()
             except Exception as e:
                 print(f"Error clearing Bluetooth alerts: {e}")
             
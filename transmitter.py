@@ -1,84 +1,217 @@
 # transmitter.py - ULTRA SIMPLE VERSION
+import logging
+import os
 import serial
 import serial.tools.list_ports
+import threading
 import time
-from typing import Optional
+from typing import Dict, List, Optional, Tuple, Union
+
+# Per-command messages are DEBUG (dropped unformatted unless enabled); failures are errors
+_log = logging.getLogger(__name__)
+
+# Wire bytes of the Arduino's commands (0 = clear, 1 = drowning, 2 = obstruction), built once
+_CMD_BYTES: Dict[Union[int, str], bytes] = {c: f"{c}\n".encode() for c in (0, 1, 2)}
+_CMD_BYTES.update({str(c): payload for c, payload in list(_CMD_BYTES.items())})
 
 class BluetoothTransmitter:
-    def __init__(self):
+    def __init__(self) -> None:
         self.ser: Optional[serial.Serial] = None
-        self.connected = False
+        self.connected: bool = False
+        # Alerts are sent from the monitor's Bluetooth worker and from the UI thread (test buttons,
+        # stop) - one write at a time, and never while the port is being closed
+        self._write_lock = threading.Lock()
+        self._last_cmd: Optional[bytes] = None  # Wire bytes of the alert state the Arduino was last sent
+        self._fd: Optional[int] = None  # Raw (non-blocking) POSIX fd of the open port, if any
+        self._ports_cache: Tuple[float, List[str]] = (0.0, [])  # (monotonic time, devices) of the last port scan
+        self._clear_timer: Optional[threading.Timer] = None  # Pending schedule() auto-clear
         
-    def list_ports(self):
-        """List available serial ports"""
-        ports = serial.tools.list_ports.comports()
-        return [port.device for port in ports]
+    def list_ports(self) -> List[str]:
+        """
+        List available serial ports
+        A port scan walks sysfs / SetupDi, so results are reused for 2 s (repeated refreshes)
+        """
+        now = time.monotonic()
+        stamp, devices = self._ports_cache
+        if now - stamp < 2.0:
+            return devices[:]
+        devices = [port.device for port in serial.tools.list_ports.comports()]
+        self._ports_cache = (now, devices)
+        return devices[:]
     
-    def connect(self, port: str, baudrate: int = 9600) -> bool:
-        """Connect to specified serial port"""
+    def connect(self, port: str, baudrate: int = 9600, fast: bool = False) -> bool:
+        """
+        Connect to specified serial port
+        fast opens with DTR held low and skips waiting for the reset - only for boards with
+        auto-reset disabled (RESET-EN jumper cut, or a capacitor on RESET)
+        """
         try:
-            self.ser = serial.Serial(port, baudrate, timeout=1)
+            self._ports_cache = (0.0, [])
+            if fast:
+                self.ser = serial.Serial(baudrate=baudrate, timeout=1, write_timeout=0.1)
+                self.ser.port = port
+                self.ser.dtr = False  # Applied as the port opens, so DTR never pulses RESET
+                self.ser.open()
+            else:
+                self.ser = serial.Serial(port, baudrate, timeout=1, write_timeout=0.1)
+            self._last_cmd = None  # The Arduino may have reset as the port opened
+            self._fd = None
+            if os.name == 'posix':
+                try:
+                    self._fd = self.ser.fileno()
+                except (AttributeError, OSError):  # Not fd-backed (e.g. a URL handler)
+                    pass
+            # USB-serial adapters (FTDI) otherwise hold each write for the 16 ms latency timer;
+            # low-latency mode drops it to 1 ms. Linux-only, and not every driver supports it
+            try:
+                self.ser.set_low_latency_mode(True)
+            except (AttributeError, NotImplementedError, OSError, ValueError):
+                pass
             self.connected = True
-            print(f"✅ Connected to {port} at {baudrate} baud")
-            time.sleep(2)  # Wait for Arduino to reset
+            _log.info("✅ Connected to %s at %s baud", port, baudrate)
+            if not fast:
+                self._wait_ready()  # Wait for Arduino to reset
             return True
         except Exception as e:
-            print(f"❌ Connection failed: {e}")
+            _log.error("❌ Connection failed: %s", e)
             self.connected = False
             return False
     
-    def disconnect(self):
+    def _wait_ready(self, timeout: float = 2.0) -> bool:
+        """
+        Wait for the sketch's READY banner after the open-triggered reset, for at most timeout s
+        Most boards finish resetting well inside the 2 s this used to sleep unconditionally;
+        links that don't reset the board (e.g. HC-05 Bluetooth) send no banner and wait it out
+        """
+        ser = self.ser
+        if ser is None:
+            return False
+        deadline = time.monotonic() + timeout
+        received = b""
+        while time.monotonic() < deadline:
+            waiting = ser.in_waiting
+            if waiting:
+                received += ser.read(waiting)
+                if b"READY" in received:
+                    return True
+            time.sleep(0.02)
+        return False
+    
+    def disconnect(self) -> None:
         """Disconnect from serial port"""
+        self._cancel_scheduled_clear()
         if self.connected and self.ser:
-            try:
-                self.ser.close()
-            except:
-                pass
-            self.connected = False
-            print("✅ Disconnected from Bluetooth")
+            with self._write_lock:
+                try:
+                    self.ser.flush()  # Let the last command out before closing
+                    self.ser.close()
+                except (serial.SerialException, OSError):
+                    pass
+                self.connected = False
+                self._last_cmd = None
+                self._fd = None
+                self._ports_cache = (0.0, [])
+            _log.info("✅ Disconnected from Bluetooth")
     
-    def send_command(self, command: int):
-        """Send simple command to Arduino"""
+    def send_command(self, command: Union[int, str], force: bool = False, sync: bool = False) -> bool:
+        """
+        Send simple command to Arduino
+        A command equal to the last one sent is skipped - the Arduino is already in that state
+        (and would restart its obstruction pulse) - unless force is set.
+        Returns once the bytes are queued with the OS; sync also waits until they are on the wire.
+        """
+        self._cancel_scheduled_clear()  # A newer state replaces any pending auto-clear
         if not self.connected or not self.ser:
-            print("❌ Not connected to Bluetooth")
+            _log.warning("❌ Not connected to Bluetooth")
             return False
             
         try:
-            command_str = f"{command}\n"
-            self.ser.write(command_str.encode())
-            self.ser.flush()
-            print(f"📡 Sent: {command}")
+            payload = _CMD_BYTES.get(command) or f"{command}\n".encode()
+            with self._write_lock:
+                # Compared as wire bytes, so 1 and "1" count as the same state
+                if payload == self._last_cmd and not force:
+                    return True
+                try:
+                    self._write(payload)
+                except serial.SerialTimeoutException:
+                    # TX buffer backed up on a slow link: what's still queued is stale, newest wins
+                    self.ser.reset_output_buffer()
+                    self._write(payload)
+                if sync:
+                    self.ser.flush()
+                self._last_cmd = payload
+            _log.debug("📡 Sent: %s", command)
             return True
-        except Exception as e:
-            print(f"❌ Failed to send: {e}")
+        except (serial.SerialException, OSError, ValueError) as e:
+            _log.error("❌ Failed to send: %s", e)
+            self._last_cmd = None
             self.connected = False
             return False
     
-    def send_drowning_alert(self):
+    def _write(self, payload: bytes) -> None:
+        """
+        Write payload, straight to the port's fd when there is one - a 2-byte command skips
+        pyserial's select loop. Anything the fd won't take right now goes through ser.write,
+        which waits for it within write_timeout.
+        """
+        if self._fd is not None:
+            try:
+                sent = os.write(self._fd, payload)
+            except BlockingIOError:
+                sent = 0
+            if sent == len(payload):
+                return
+            payload = payload[sent:]
+        if self.ser is None:
+            raise serial.SerialException("Port not open")
+        self.ser.write(payload)
+    
+    def schedule(self, command: Union[int, str], hold_s: float) -> bool:
+        """
+        Send command now and clear it after hold_s seconds, without blocking the caller
+        Any command sent in the meantime cancels the clear.
+        """
+        if not self.send_command(command):
+            return False
+        timer = threading.Timer(hold_s, self._scheduled_clear)
+        timer.daemon = True
+        self._clear_timer = timer
+        timer.start()
+        return True
+    
+    def _scheduled_clear(self) -> None:
+        if self._clear_timer is threading.current_thread():
+            self.send_clear_alert()
+    
+    def _cancel_scheduled_clear(self) -> None:
+        timer, self._clear_timer = self._clear_timer, None
+        if timer is not None:
+            timer.cancel()
+    
+    def send_drowning_alert(self) -> bool:
         """Send drowning alert"""
         return self.send_command(1)
     
-    def send_obstruction_alert(self):
+    def send_obstruction_alert(self) -> bool:
         """Send obstruction alert"""
         return self.send_command(2)
     
-    def send_clear_alert(self):
+    def send_clear_alert(self) -> bool:
         """Send clear alert"""
         return self.send_command(0)
 
 # Test
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s")
     bt = BluetoothTransmitter()
     ports = bt.list_ports()
     print("Ports:", ports)
     
     if ports and bt.connect(ports[0]):
         print("Testing...")
-        bt.send_drowning_alert()
-        time.sleep(3)
-        bt.send_clear_alert()
-        time.sleep(1)
-        bt.send_obstruction_alert()
-        time.sleep(3)
-        bt.send_clear_alert()
+        # Drowning for 3 s, then obstruction for 3 s starting 1 s after that clear -
+        # the timers do the holding, so the only wait is for the last clear to go out
+        bt.schedule(1, 3.0)
+        threading.Timer(4.0, bt.schedule, (2, 3.0)).start()
+        time.sleep(7.5)
         bt.disconnect()
\ No newline at end of file